@@ -0,0 +1,186 @@
+# bundle_parser.py
+
+
+import posixpath
+import re
+from typing import NamedTuple
+
+
+FILE_PATH_PATTERN = re.compile(r"###FilePath:\s*(.+)")
+FENCE_LINE = re.compile(r"^\s*```")
+
+LANGUAGES = {
+    ".tsx": "tsx",
+    ".ts": "typescript",
+    ".jsx": "jsx",
+    ".js": "javascript",
+    ".json": "json",
+    ".md": "markdown",
+}
+
+
+class BundleFile(NamedTuple):
+    path: str
+    language: str
+    content: str
+    start: int  # byte offset of the `###FilePath:` line
+    end: int    # byte offset just past the file's last line
+
+
+def normalize_bundle_path(raw: str) -> str:
+    """Marker path without the quotes, backticks or bold markers models add; backslashes → /, `./` collapsed"""
+    path = raw.strip().strip("`'\"*").strip().replace("\\", "/")
+    return posixpath.normpath(path) if path else ""
+
+
+def unsafe_path_reason(path: str):
+    """Why a bundle path must not be written anywhere, or None"""
+    if not path or path == ".":
+        return "empty path"
+    if path.startswith("/") or re.match(r"^[A-Za-z]:", path):
+        return "absolute path"
+    if path == ".." or path.startswith("../"):
+        return "path traversal"
+    return None
+
+
+def _trim_fences(lines: list) -> tuple:
+    """(start, end, trailing) of a file's code without the blank and ``` fence lines around it – fences inside
+    are kept. A fenced file ends at the fence closing its opening one; `trailing` is the index of the first
+    line of prose left after it (discarded), else None"""
+    start, end = 0, len(lines)
+    while start < end and not lines[start].strip():
+        start += 1
+
+    opening = FENCE_LINE.match(lines[start]) if start < end else None
+    if opening:
+        ticks = len(lines[start].strip()) - len(lines[start].strip().lstrip("`"))
+        closing = re.compile(rf"^\s*`{{{ticks},}}\s*$")
+        depth = 0  # fenced blocks inside the file (code samples in a .md)
+        for i in range(start + 1, end):
+            if closing.match(lines[i]) and not depth:
+                end = i
+                break
+            if FENCE_LINE.match(lines[i]):
+                depth += 1 if lines[i].strip().strip("`") else -1
+                depth = max(depth, 0)
+
+    trailing = next((i for i in range(end + 1, len(lines)) if lines[i].strip() and not FENCE_LINE.match(lines[i])), None)
+    while start < end and (not lines[start].strip() or FENCE_LINE.match(lines[start])):
+        start += 1
+    while end > start and (not lines[end - 1].strip() or FENCE_LINE.match(lines[end - 1])):
+        end -= 1
+    return start, end, trailing
+
+
+class BundleParser:
+    """Incremental `###FilePath:` bundle parser: feed text chunks as they arrive, get each file as soon as the
+    next marker (or close()) ends it. Unsafe paths are reported in `issues` and never returned;
+    duplicate paths are returned and reported"""
+
+    def __init__(self):
+        self.issues = []      # [{path, line, issue, message}]
+        self._buffer = ""
+        self._offset = 0      # byte offset of the start of _buffer
+        self._line_no = 0
+        self._current = None  # (path, start offset, marker line number)
+        self._lines = []
+        self._ends = []       # byte offset past each of _lines
+        self._seen = {}       # path → marker line number
+        self._started = False  # a marker has been seen
+        self._preamble = []   # line numbers of text before the first marker
+
+    def _issue(self, path, line, issue, message):
+        self.issues.append({"path": path, "line": line, "issue": issue, "message": message})
+
+    def _finish(self) -> list:
+        if self._current is None:
+            return []
+        path, start, line_no = self._current
+        self._current = None
+        first, last, trailing = _trim_fences(self._lines)
+        lines, ends = self._lines[first:last], self._ends[first:last]
+        if trailing is not None:
+            self._issue(path, line_no + 1 + trailing, "trailing-text", "Text after the closing ``` fence – dropped")
+        self._lines, self._ends = [], []
+        if not lines:
+            self._issue(path, line_no, "empty-file", "No content after the marker – skipped")
+            return []
+        if path in self._seen:
+            self._issue(path, line_no, "duplicate-path", f"Also defined at line {self._seen[path]} – the later block wins")
+        self._seen[path] = line_no
+        language = LANGUAGES.get(posixpath.splitext(path)[1].lower(), "")
+        return [BundleFile(path, language, "\n".join(lines), start, ends[-1])]
+
+    def _line(self, line: str, start: int, end: int) -> list:
+        self._line_no += 1
+        match = FILE_PATH_PATTERN.search(line)
+        if not match:
+            if self._current is not None:
+                self._lines.append(line.rstrip())
+                self._ends.append(end)
+            elif not self._started and line.strip() and not FENCE_LINE.match(line):
+                self._preamble.append(self._line_no)
+            return []
+
+        if not self._started:
+            self._started = True
+            self._report_preamble()
+        done = self._finish()
+        path = normalize_bundle_path(match.group(1))
+        reason = unsafe_path_reason(path)
+        if reason:
+            self._issue(match.group(1).strip(), self._line_no, "unsafe-path", f"{reason.capitalize()} – skipped")
+            # Lines up to the next marker belong to the rejected file and are discarded
+            self._current = None
+        else:
+            self._current = (path, start, self._line_no)
+        return done
+
+    def _report_preamble(self):
+        if self._preamble:
+            self._issue("", self._preamble[0], "text-outside-files",
+                        f"{len(self._preamble)} line(s) before the first ###FilePath marker – dropped")
+            self._preamble = []
+
+    def feed(self, chunk: str) -> list:
+        """Parse a chunk of bundle text; returns the files completed by it"""
+        self._buffer += chunk
+        done = []
+        lines = self._buffer.split("\n")
+        self._buffer = lines.pop()  # incomplete last line waits for the next chunk
+        for line in lines:
+            start = self._offset
+            self._offset += len(line.encode("utf-8")) + 1
+            done.extend(self._line(line, start, self._offset))
+        return done
+
+    def close(self) -> list:
+        """Flush the last file"""
+        done = []
+        if self._buffer:
+            start = self._offset
+            self._offset += len(self._buffer.encode("utf-8"))
+            done.extend(self._line(self._buffer, start, self._offset))
+            self._buffer = ""
+        self._report_preamble()
+        return done + self._finish()
+
+
+def parse_bundle_files(content: str) -> tuple:
+    """Parse a whole bundle. Returns (records with later duplicates replacing earlier ones, issues)"""
+    parser = BundleParser()
+    files = {}
+    for record in parser.feed(content) + parser.close():
+        files[record.path] = record
+    return list(files.values()), parser.issues
+
+
+def parse_bundle(content: str) -> list:
+    """Split a `###FilePath:` bundle into [(path, content)] – fence lines around each file are dropped"""
+    return [(record.path, record.content) for record in parse_bundle_files(content)[0]]
+
+
+def render_bundle(files: list) -> str:
+    """Join [(path, content)] back into `###FilePath:` bundle text"""
+    return "\n\n".join(f"###FilePath: {path}\n\n{content.strip()}\n" for path, content in files)
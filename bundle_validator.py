@@ -0,0 +1,291 @@
+# bundle_validator.py
+
+
+import posixpath
+import re
+
+from corpus_cache import SOURCE_EXTENSIONS
+
+
+# ====================== PATTERNS ======================
+
+
+IMPORT_START = re.compile(r"^\s*import\b")
+IMPORT_END = re.compile(r"""(?:\bfrom\s+|^\s*import\s+)(['"])([^'"]+)\1\s*;?\s*$""")
+IMPORT_SOURCE = re.compile(r"""(\bfrom\s+|^\s*import\s+)(['"])([^'"]+)\2""", re.MULTILINE)
+NAMESPACE_IMPORT = re.compile(r"""^\s*import\s+\*\s+as\s+(\w+)\s+from\s+(['"])@app/components\2\s*;?\s*$""", re.MULTILINE)
+NAMED_COMPONENTS_IMPORT = re.compile(r"""^\s*import\s*\{([^}]*)\}\s*from\s*(['"])@app/components\2\s*;?\s*$""", re.MULTILINE)
+COMPONENT_ID = re.compile(r"""\bid=(["'])([^"']*)\1""")
+TITLE_CASE = re.compile(r"^[A-Z][A-Za-z0-9]*$")
+TRANSLATION_CALL = re.compile(r"""\bt\(\s*(['"])([^'"]+)\1\s*\)""")
+TRANSLATION_KEY = re.compile(r"^[A-Z][A-Za-z0-9]*?(?:Lbl|Btn|Txt|Plc|Chk|Info|Error|Opt)(?:[A-Z0-9][A-Za-z0-9]*)?$")
+TRANSLATION_ENTRY = re.compile(r"^\s*([A-Za-z_][A-Za-z0-9_]*)\s*:", re.MULTILINE)
+MISPLACED_FEATURE_FILE = re.compile(r"^(app/features/[^/]+)/views/(?:.+/)?(hooks|schemas)/([^/]+)$")
+MISPLACED_HOOK = re.compile(r"^(app/features/[^/]+)/views/(?:.+/)?(use-[^/]+\.tsx?)$")
+MISPLACED_SCHEMA = re.compile(r"^(app/features/[^/]+)/views/(?:.+/)?([^/]+-schema\.ts)$")
+
+# Conventions import order: React → Third-party → Components → Theme/utils → Assets → Feature → Local
+# Component type helpers (`@app/components/label/types`) sit with the local view imports
+IMPORT_GROUPS = [
+    ("react", re.compile(r"^(react|react-native)$")),
+    ("local", re.compile(r"^@?app/components/.+/types$")),
+    ("components", re.compile(r"^@?app/components(/|$)")),
+    ("theme", re.compile(r"^(react-core|@?app/(utils|theme|constants|hooks))(/|$)")),
+    ("assets", re.compile(r"^@?app/assets(/|$)")),
+    ("feature", re.compile(r"^(@app|app)/")),
+    ("local", re.compile(r"^\.")),
+]
+GROUP_ORDER = {"react": 0, "third-party": 1, "components": 2, "theme": 3, "assets": 4, "feature": 5, "local": 6}
+
+
+def import_group(source: str) -> str:
+    for group, pattern in IMPORT_GROUPS:
+        if pattern.search(source):
+            return group
+    return "third-party"
+
+
+def _violation(path, rule, message, line=None, fixed=False):
+    return {"path": path, "rule": rule, "line": line, "message": message, "fixed": fixed}
+
+
+def _line_of(content: str, index: int) -> int:
+    return content.count("\n", 0, index) + 1
+
+
+# ====================== IMPORT BLOCK ======================
+
+
+def split_import_block(content: str) -> tuple:
+    """Split leading imports into [(comment lines + statement lines, source)] and the remaining body"""
+    lines = content.split("\n")
+    statements = []
+    pending = []
+    current = None
+    end = len(lines)
+
+    for i, line in enumerate(lines):
+        if current is not None:
+            current.append(line)
+            match = IMPORT_END.search(line)
+            if match:
+                statements.append((pending + current, match.group(2)))
+                pending, current = [], None
+            continue
+
+        stripped = line.strip()
+        if IMPORT_START.match(line):
+            match = IMPORT_END.search(line)
+            if match:
+                statements.append((pending + [line], match.group(2)))
+                pending = []
+            else:
+                current = [line]
+        elif not stripped:
+            continue
+        elif stripped.startswith("//"):
+            pending.append(line)
+        else:
+            end = i
+            break
+
+    if current is not None:
+        # Unterminated import – leave the file alone
+        return [], content
+
+    # Comments right before the body belong to the body
+    body = "\n".join(pending + lines[end:]) if end < len(lines) or pending else ""
+    return statements, body
+
+
+def _check_import_order(path, content, fix):
+    statements, body = split_import_block(content)
+    ranks = [GROUP_ORDER[import_group(source)] for _, source in statements]
+    if ranks == sorted(ranks):
+        return content, []
+
+    if not fix:
+        return content, [_violation(path, "import-order", "Imports are not in React → Third-party → Components → Theme/utils → Assets → Feature → Local order")]
+
+    ordered = sorted(zip(ranks, range(len(statements)), statements))
+    header = "\n".join(line for _, _, (stmt_lines, _) in ordered for line in stmt_lines)
+    content = header + "\n\n" + body.lstrip("\n")
+    return content, [_violation(path, "import-order", "Reordered imports", fixed=True)]
+
+
+# ====================== IMPORT PATHS ======================
+
+
+def _resolve_relative(path: str, source: str) -> str:
+    return posixpath.normpath(posixpath.join(posixpath.dirname(path), source))
+
+
+def _check_import_paths(path, content, fix, moved, origin=None):
+    """`../` and bare `app/` imports must use the @app alias; imports of moved files follow the move.
+    A relocated file passes its `origin` (pre-move path) – its relative imports were written against that"""
+    violations = []
+    origin = origin or path
+
+    def replace(match):
+        prefix, quote, source = match.groups()
+        if source.startswith("app/"):
+            resolved = source
+        elif source.startswith("."):
+            resolved = _resolve_relative(origin, source)
+        else:
+            return match.group(0)
+
+        target = moved.get(resolved, resolved)
+        if source.startswith("./") and target == resolved and origin == path:
+            return match.group(0)  # Local view-level import – allowed
+        if not target.startswith("app/"):
+            return match.group(0)
+
+        alias = "@app/" + target[len("app/"):]
+        violations.append(_violation(
+            path, "relative-import",
+            f"'{source}' → '{alias}'" if fix else f"Use path alias '{alias}' instead of '{source}'",
+            _line_of(content, match.start()), fixed=fix
+        ))
+        return f"{prefix}{quote}{alias}{quote}"
+
+    new_content = IMPORT_SOURCE.sub(replace, content)
+    return (new_content if fix else content), violations
+
+
+def _check_namespace_import(path, content, fix):
+    match = NAMESPACE_IMPORT.search(content)
+    if not match:
+        return content, []
+    if not fix:
+        return content, [_violation(path, "namespace-import", "Use direct component imports instead of `import * as`", _line_of(content, match.start()))]
+
+    namespace = match.group(1)
+    used = re.findall(rf"\b{namespace}\.(\w+)", content)
+    content = re.sub(rf"\b{namespace}\.(\w+)", r"\1", content)
+
+    # Merge into an existing named @app/components import when there is one
+    named = NAMED_COMPONENTS_IMPORT.search(content)
+    existing = re.sub(r"//[^\n]*", "", named.group(1)).split(",") if named else []
+    names = list(dict.fromkeys([n.strip() for n in existing if n.strip()] + used))
+    statement = f"import {{{', '.join(names)}}} from '@app/components';"
+    if named:
+        content = NAMED_COMPONENTS_IMPORT.sub(lambda _: statement, content, count=1)
+        content = NAMESPACE_IMPORT.sub("", content, count=1)
+    else:
+        content = NAMESPACE_IMPORT.sub(lambda _: statement, content, count=1)
+    return content, [_violation(path, "namespace-import", f"Replaced `import * as {namespace}` with direct imports", fixed=True)]
+
+
+# ====================== IDS & TRANSLATIONS ======================
+
+
+def to_component_id(value: str) -> str:
+    """'submit-button_next' → 'SubmitButtonNext' (inner capitals kept)"""
+    return "".join(w[0].upper() + w[1:] for w in re.findall(r"[A-Za-z0-9]+", value))
+
+
+def _check_ids(path, content, fix):
+    violations = []
+
+    def replace(match):
+        quote, value = match.groups()
+        if TITLE_CASE.match(value) or not value:
+            return match.group(0)
+        fixed_value = to_component_id(value)
+        violations.append(_violation(
+            path, "id-case",
+            f"id '{value}' → '{fixed_value}'" if fix else f"id '{value}' is not TitleCase",
+            _line_of(content, match.start()), fixed=fix
+        ))
+        return f"id={quote}{fixed_value}{quote}"
+
+    new_content = COMPONENT_ID.sub(replace, content)
+    return (new_content if fix else content), violations
+
+
+def _check_translation_keys(path, content, defined_keys):
+    violations = []
+    for match in TRANSLATION_CALL.finditer(content):
+        key = match.group(2)
+        line = _line_of(content, match.start())
+        if not TRANSLATION_KEY.match(key):
+            violations.append(_violation(path, "translation-key", f"'{key}' does not follow <<Journey>><<ScreenName>><<Abbrev>><<Field>>", line))
+        elif defined_keys is not None and key not in defined_keys:
+            violations.append(_violation(path, "missing-translation", f"'{key}' is not defined in translations.ts", line))
+    return violations
+
+
+# ====================== BUNDLE ======================
+
+
+def _feature_level_path(path: str):
+    """Return the feature-level location for hooks/schemas placed inside views, else None"""
+    match = MISPLACED_FEATURE_FILE.match(path)
+    if match:
+        return f"{match.group(1)}/{match.group(2)}/{match.group(3)}"
+    match = MISPLACED_HOOK.match(path)
+    if match:
+        return f"{match.group(1)}/hooks/{match.group(2)}"
+    match = MISPLACED_SCHEMA.match(path)
+    if match:
+        return f"{match.group(1)}/schemas/{match.group(2)}"
+    return None
+
+
+def _module_path(path: str) -> str:
+    """File path → import specifier form (no extension, no /index)"""
+    for ext in SOURCE_EXTENSIONS:
+        if path.endswith(ext):
+            path = path[:-len(ext)]
+            break
+    return path[:-len("/index")] if path.endswith("/index") else path
+
+
+def check_bundle(files: list, fix: bool = True) -> tuple:
+    """Validate [(path, content)] against the generation conventions; mechanical rules are fixed when `fix` is set.
+    Returns (files, violations) – each violation dict has path, rule, line, message and fixed"""
+    violations = []
+
+    # 1. Hooks/schemas belong at feature level
+    moved = {}
+    relocated = []
+    origins = {}  # current path → path the file was generated at
+    for path, content in files:
+        original = path
+        target = _feature_level_path(path)
+        if target:
+            violations.append(_violation(
+                path, "feature-level-path",
+                f"Moved to {target}" if fix else f"Belongs at feature level: {target}",
+                fixed=fix
+            ))
+            if fix:
+                moved[_module_path(path)] = _module_path(target)
+                path = target
+        relocated.append((path, content))
+        origins[path] = original
+    files = relocated
+
+    # Keys defined across all translations.ts files (None when the bundle has none)
+    translation_files = [c for p, c in files if p.endswith("translations.ts")]
+    defined_keys = None
+    if translation_files:
+        defined_keys = {key for c in translation_files for key in TRANSLATION_ENTRY.findall(c)}
+
+    result = []
+    for path, content in files:
+        if path.endswith(SOURCE_EXTENSIONS):
+            content, found = _check_namespace_import(path, content, fix)
+            violations += found
+            content, found = _check_import_paths(path, content, fix, moved, origins.get(path))
+            violations += found
+            content, found = _check_import_order(path, content, fix)
+            violations += found
+        if path.endswith((".tsx", ".jsx")):
+            content, found = _check_ids(path, content, fix)
+            violations += found
+            violations += _check_translation_keys(path, content, defined_keys)
+        result.append((path, content))
+
+    return result, violations
@@ -0,0 +1,118 @@
+# comment_stripper.py
+
+
+import re
+
+
+# Next token that can start a comment, a string or a regex in code context.
+# Everything between two matches is plain code and is copied in one slice.
+# Bundles wrap files in ``` fences and ###FilePath markers – those lines are copied as they are
+TOKENS = (
+    r"""(?P<marker>(?<![^\n])###FilePath:[^\n]*)"""
+    r"""|(?P<fence>(?<![^\n])```[^\n]*)"""
+    r"""|(?P<jsx>\{[ \t]*/\*.*?\*/[ \t]*\})"""
+    r"""|(?P<block>/\*.*?\*/)"""
+    r"""|(?P<line>//[^\n]*)"""
+    r"""|(?P<string>'(?:[^'\\\n]|\\.)*'|"(?:[^"\\\n]|\\.)*")"""
+    r"""|(?P<template>`)"""
+    r"""|(?P<slash>(?<!<)/(?![/*>]))"""
+)
+
+# The leading lookahead lets the regex engine skip to candidate characters instead of trying every branch everywhere
+CODE_TOKEN = re.compile(r"""(?=[{/'"`#])(?:""" + TOKENS + ")", re.DOTALL)
+
+# Inside a `${...}` substitution braces are tracked too, to find where the template resumes
+NESTED_TOKEN = re.compile(r"""(?=[{}/'"`#])(?:""" + TOKENS + r"""|(?P<open>\{)|(?P<close>\}))""", re.DOTALL)
+
+# Template literal text up to its end or the next substitution – never past a bundle marker or fence,
+# so a stray backtick in prose cannot swallow the files after it
+TEMPLATE_CHUNK = re.compile(r"(?:[^`\\$\n]|\n(?!###FilePath:|```)|\\.|\$(?!\{))*(?:`|\$\{)", re.DOTALL)
+
+REGEX_LITERAL = re.compile(r"/(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*")
+
+# A `/` after one of these (or a keyword below) starts a regex; anywhere else it divides.
+# `<` and `}` are left out: `</View>` and `{x} />` are far more common in TSX than regexes there
+# (`</` and `/>` are not even tokens)
+REGEX_PRECEDERS = set("(,=:[!&|?{;+-*%~^")
+REGEX_KEYWORDS = re.compile(r"(?:^|[^\w$.])(?:return|typeof|case|do|else|in|of|new|delete|void|throw|yield|await)$")
+
+TRAILING_SPACE = re.compile(r"[ \t]+\Z")
+BLANK_RUNS = re.compile(r"\n(?:[ \t]*\n)+")
+
+
+def _regex_allowed(out: list) -> bool:
+    """Whether a `/` following the code emitted so far starts a regex literal"""
+    for piece in reversed(out):
+        stripped = piece.rstrip()
+        if stripped:
+            return stripped[-1] in REGEX_PRECEDERS or bool(REGEX_KEYWORDS.search(stripped[-12:]))
+    return True
+
+
+def strip_comments(source: str) -> str:
+    """Remove //, /* */ and JSX {/* */} comments in one left-to-right pass.
+    Strings, template literals (with nested `${}`) and regex literals are copied untouched,
+    so `https://...` in a string or `/\\/\\/+/` in a regex survive"""
+    out = []
+    pos = 0
+    end = len(source)
+    stack = []  # one entry per open `${` or `{` inside a substitution: True = template resumes at its `}`
+    while pos < end:
+        match = (NESTED_TOKEN if stack else CODE_TOKEN).search(source, pos)
+        if not match:
+            out.append(source[pos:])
+            break
+        start = match.start()
+        out.append(source[pos:start])
+        kind = match.lastgroup
+        pos = match.end()
+
+        if kind == "line":
+            out[-1] = TRAILING_SPACE.sub("", out[-1])
+        elif kind in ("block", "jsx"):
+            if source[pos:pos + 1] in ("\n", ""):
+                out[-1] = TRAILING_SPACE.sub("", out[-1])
+            # Keep adjacent tokens apart (`a/**/b`) and keep line structure for multi-line comments
+            elif "\n" in match.group():
+                out[-1] = TRAILING_SPACE.sub("", out[-1])
+                out.append("\n")
+            elif start and source[start - 1].isalnum():
+                out.append(" ")
+        elif kind in ("string", "fence"):
+            out.append(match.group())
+        elif kind == "marker":
+            stack.clear()
+            out.append(match.group())
+        elif kind == "slash":
+            literal = REGEX_LITERAL.match(source, start) if _regex_allowed(out) else None
+            if literal:
+                pos = literal.end()
+            out.append(source[start:pos])
+        elif kind == "open":
+            stack.append(False)
+            out.append("{")
+        elif kind == "close":
+            if stack.pop():
+                pos = _copy_template(source, start, out)
+            else:
+                out.append("}")
+        else:  # template
+            pos = _copy_template(source, start, out)
+
+        if kind in ("template", "close") and out[-1].endswith("${"):
+            stack.append(True)
+    return "".join(out)
+
+
+def _copy_template(source: str, start: int, out: list) -> int:
+    """Copy a template literal chunk starting at its backtick (or closing `}`) through the end or next `${`"""
+    chunk = TEMPLATE_CHUNK.match(source, start + 1)
+    stop = chunk.end() if chunk else start + 1  # unterminated – the backtick is copied as plain text
+    out.append(source[start:stop])
+    return stop
+
+
+def remove_comments_from_code(content: str) -> str:
+    """Remove //, /* */, and {/** */} comments + clean empty lines"""
+    # Lines emptied by a comment are left blank – collapse runs of blank lines into one
+    return BLANK_RUNS.sub("\n\n", strip_comments(content))
@@ -0,0 +1,219 @@
+# component_digest.py
+
+
+import os
+import re
+
+from comment_stripper import strip_comments
+from component_resolver import INDEX_FILES, extract_exported_names
+from corpus_cache import get_corpus_cache
+
+
+DECLARATION_START = re.compile(r"^export\s+(?:declare\s+)?(interface|type|enum|const\s+enum)\s+([A-Za-z_]\w*)", re.MULTILINE)
+FC_COMPONENT = re.compile(r"const\s+([A-Z]\w*)\s*:\s*(?:React\.)?FC<\s*([A-Za-z_]\w*)")
+DESTRUCTURED_PARAMS = re.compile(r"const\s+([A-Z]\w*)\s*(?::[^=]+)?=\s*(?:\(\s*)?\{")
+DEFAULT_PROPS = re.compile(r"([A-Z]\w*)\.defaultProps\s*=\s*\{")
+CONTINUATION = re.compile(r"\s*\n\s*(?=[|&])|(?<=:)\s*\n\s*")
+PROP_MEMBER = re.compile(r"^\s*(?:readonly\s+)?['\"]?([A-Za-z_]\w*)['\"]?(\?)?\s*:")
+
+TYPES_FILE = re.compile(r"^types?\.tsx?$|[-.]types?\.tsx?$")
+
+# Folder path → ({file: (mtime, size)}, digest) – rebuilt only when a file changes
+_DIGEST_CACHE = {}
+
+
+# ====================== SCANNING ======================
+
+
+def _matching_brace(text: str, start: int) -> int:
+    """Index just past the brace that closes text[start] (`{`), skipping strings"""
+    depth = 0
+    quote = None
+    i = start
+    while i < len(text):
+        ch = text[i]
+        if quote:
+            if ch == "\\":
+                i += 1
+            elif ch == quote:
+                quote = None
+        elif ch in "'\"`":
+            quote = ch
+        elif ch == "{":
+            depth += 1
+        elif ch == "}":
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return len(text)
+
+
+def _split_top_level(body: str, separators: str = ",;\n") -> list:
+    """Split an object/interface body on separators outside nested brackets and strings"""
+    items = []
+    depth = 0
+    quote = None
+    current = []
+    previous = ""
+    for ch in body:
+        if quote:
+            current.append(ch)
+            if ch == quote:
+                quote = None
+            continue
+        if ch in "'\"`":
+            quote = ch
+        elif ch in "{[(<":
+            depth += 1
+        elif ch in "}])>" and not (ch == ">" and previous == "="):  # `=>` is not a bracket
+            depth -= 1
+        previous = ch
+        if ch in separators and depth == 0:
+            items.append("".join(current).strip())
+            current = []
+        else:
+            current.append(ch)
+    items.append("".join(current).strip())
+    return [item for item in items if item]
+
+
+def _compact(text: str) -> str:
+    return " ".join(text.split())
+
+
+# ====================== EXTRACTION ======================
+
+
+def extract_declarations(source: str) -> list:
+    """Exported interfaces, type aliases and enums as compact one-line declarations"""
+    source = strip_comments(source)
+    declarations = []
+    for match in DECLARATION_START.finditer(source):
+        kind, name = match.groups()
+        rest = match.end()
+        brace = source.find("{", rest)
+        if kind == "type":
+            equals = source.find("=", rest)
+            if equals < 0:
+                continue
+            if brace < 0 or source[equals + 1:brace].strip():
+                # Non-object alias (union, function type, ...) runs to the first top-level `;`
+                body = _split_top_level(source[equals + 1:], ";")[0].split("\n\n")[0]
+                declarations.append({"kind": kind, "name": name, "text": _compact(f"export type {name} = {body};"), "members": []})
+                continue
+        if brace < 0:
+            continue
+        end = _matching_brace(source, brace)
+        header = _compact(source[match.start():brace].replace("=", " = "))
+        # Continuation lines (`toValue:\n | number\n | ...`) belong to the member above
+        body = CONTINUATION.sub(" ", source[brace + 1:end - 1])
+        members = _split_top_level(body)
+        declarations.append({
+            "kind": kind,
+            "name": name,
+            "text": f"{header} {{{'; '.join(_compact(m) for m in members)}}}" if "enum" not in kind
+            else f"{header} {{{', '.join(_compact(m) for m in members)}}}",
+            "members": members,
+        })
+    return declarations
+
+
+def extract_defaults(source: str) -> dict:
+    """Component name → {prop: default} from destructured parameters and `.defaultProps`"""
+    source = strip_comments(source)
+    defaults = {}
+    for pattern in (DESTRUCTURED_PARAMS, DEFAULT_PROPS):
+        for match in pattern.finditer(source):
+            brace = match.end() - 1
+            body = source[brace + 1:_matching_brace(source, brace) - 1]
+            separator = "=" if pattern is DESTRUCTURED_PARAMS else ":"
+            for item in _split_top_level(body, ","):
+                name, sep, value = item.partition(separator)
+                name = name.strip()
+                if sep and re.fullmatch(r"[A-Za-z_]\w*", name) and not value.startswith(("=", ">")):
+                    defaults.setdefault(match.group(1), {})[name] = _compact(value)
+    return defaults
+
+
+def required_props(declaration: dict) -> list:
+    """Names of the non-optional members of an interface/object type"""
+    names = []
+    for member in declaration["members"]:
+        match = PROP_MEMBER.match(member)
+        if match and not match.group(2):
+            names.append(match.group(1))
+    return names
+
+
+# ====================== DIGEST ======================
+
+
+def _usage_example(component: str, props_type: str, declarations: dict) -> str:
+    declaration = declarations.get(props_type)
+    props = [p for p in required_props(declaration) if p != "id"] if declaration else []
+    attributes = "".join(f" {p}={{...}}" for p in props)
+    return f'<{component} id="{component}FieldName"{attributes} />'
+
+
+def _build_folder_digest(base_path: str, folder: str, files: list, sources: dict) -> str:
+    rel = lambda fp: os.path.relpath(fp, base_path).replace("\\", "/")
+
+    index_path = next((os.path.join(base_path, folder, n) for n in INDEX_FILES if os.path.join(base_path, folder, n) in sources), None)
+    exported = extract_exported_names(sources[index_path]) if index_path else []
+
+    lines = [f"\n// COMPONENT: {folder}"]
+    if exported:
+        lines.append(f"// import {{{', '.join(exported)}}} from '@app/components';")
+
+    declarations = {}
+    for fp in files:
+        if not (TYPES_FILE.search(os.path.basename(fp)) or fp == index_path):
+            continue
+        found = extract_declarations(sources[fp])
+        if found:
+            lines.append(f"// {rel(fp)}")
+            lines.extend(d["text"] for d in found)
+            declarations.update((d["name"], d) for d in found)
+
+    if index_path:
+        source = sources[index_path]
+        props_types = dict(FC_COMPONENT.findall(strip_comments(source)))
+        for component in exported:
+            props_type = props_types.get(component) or next(
+                (f"{component}{s}" for s in ("Props", "Properties") if f"{component}{s}" in declarations), None
+            )
+            if props_type or component in props_types:
+                lines.append(f"// usage: {_usage_example(component, props_type, declarations)}")
+        for component, values in extract_defaults(source).items():
+            if component in exported and values:
+                lines.append(f"// {component} defaults: " + ", ".join(f"{k} = {v}" for k, v in values.items()))
+    return "\n".join(lines)
+
+
+def build_component_digest(base_path: str, folders: list) -> str:
+    """Compact API digest (exports, props interfaces, enums, defaults, usage) of the selected component folders.
+    Each folder is rebuilt only when one of its files changes (mtime/size, as seen by the corpus cache)"""
+    base_path = os.path.abspath(base_path)  # file paths come back absolute from the corpus cache
+    cache = get_corpus_cache(base_path)
+    folder_files = {
+        folder: cache.folder_sources(folder)
+        for folder in folders if os.path.isdir(os.path.join(base_path, folder))
+    }
+    # One concurrent pass over every file; unchanged ones come straight from the corpus cache
+    sources = cache.read_many([fp for files in folder_files.values() for fp in files])
+
+    digests = []
+    for folder, files in folder_files.items():
+        path = os.path.join(base_path, folder)
+        signature = {fp: cache.signature(fp) for fp in files}
+
+        cached = _DIGEST_CACHE.get(path)
+        if cached and cached[0] == signature:
+            digests.append(cached[1])
+            continue
+        digest = _build_folder_digest(base_path, folder, files, {fp: sources.get(fp) or "" for fp in files})
+        _DIGEST_CACHE[path] = (signature, digest)
+        digests.append(digest)
+    cache.save()
+    return "\n".join(digests)
@@ -0,0 +1,143 @@
+# component_graph.py
+
+
+import os
+import posixpath
+import re
+
+from component_resolver import INDEX_FILES, extract_exported_names
+from corpus_cache import get_corpus_cache
+from token_budget import estimate_tokens
+
+
+# `import X from '..'`, `import {A, B} from '..'`, `export * from '..'`, `import '..'`, `require('..')`
+IMPORT_STATEMENT = re.compile(
+    r"""(?:^|[;}\n])\s*(?:import|export)\s+(?:type\s+)?(?:([\w*{}\s,$]+?)\s*from\s*)?['"]([^'"\n]+)['"]"""
+    r"""|\brequire\(\s*['"]([^'"\n]+)['"]\s*\)"""
+)
+IMPORTED_NAME = re.compile(r"(?:^|[{,])\s*(?:type\s+)?([A-Z]\w*)")
+
+# Absolute specifiers that point into the component library (`app/components/label`)
+LIBRARY_ALIASES = ("@app/components", "app/components")
+
+# File path → (content, [(specifier, imported names)]) – a file is re-parsed only when its content changes
+_FILE_IMPORTS = {}
+
+
+def parse_imports(source: str) -> list:
+    """[(specifier, [PascalCase names imported])] of every import/re-export/require in a file"""
+    imports = []
+    for match in IMPORT_STATEMENT.finditer(source or ""):
+        clause, specifier, required = match.groups()
+        if required:
+            imports.append((required, []))
+        else:
+            imports.append((specifier, IMPORTED_NAME.findall(clause or "")))
+    return imports
+
+
+class ImportGraph:
+    """Folder-level dependency graph of a component library, parsed lazily as folders are reached.
+    Only relative imports and `app/components/...` aliases count as edges; packages are ignored"""
+
+    def __init__(self, base_path: str, folders: list):
+        self.base_path = os.path.abspath(base_path)
+        self.folders = set(folders)
+        self.cache = get_corpus_cache(base_path)
+        self.edges = {}    # folder → {imported folder: specifier}
+        self.tokens = {}   # folder → source tokens
+        self._exported_by = None
+
+    def _folder_sources(self, folder: str) -> dict:
+        paths = self.cache.folder_sources(folder)
+        return {fp: content for fp, content in self.cache.read_many(paths).items() if content is not None}
+
+    def _barrel_owner(self, name: str):
+        """Folder exporting a component imported from the library barrel (`from 'app/components'`)"""
+        if self._exported_by is None:
+            self._exported_by = {}
+            for folder in sorted(self.folders):
+                for file in INDEX_FILES:
+                    content = self.cache.read(os.path.join(self.base_path, folder, file))
+                    if content is not None:
+                        for exported in extract_exported_names(content):
+                            self._exported_by.setdefault(exported, folder)
+                        break
+        return self._exported_by.get(name)
+
+    def _resolve(self, file_path: str, specifier: str, names: list) -> list:
+        """Library folders an import specifier points to"""
+        if specifier.startswith("."):
+            rel_dir = os.path.relpath(os.path.dirname(file_path), self.base_path).replace("\\", "/")
+            target = posixpath.normpath(posixpath.join(rel_dir, specifier))
+            if target.startswith(".."):
+                return []
+            return [target.split("/")[0]]
+        for alias in LIBRARY_ALIASES:
+            if specifier == alias:
+                return [self._barrel_owner(name) for name in names]
+            if specifier.startswith(alias + "/"):
+                return [specifier[len(alias) + 1:].split("/")[0]]
+        return []
+
+    def dependencies(self, folder: str) -> dict:
+        """{imported folder: specifier} for one component folder"""
+        if folder in self.edges:
+            return self.edges[folder]
+        deps = {}
+        sources = self._folder_sources(folder)
+        for fp, content in sources.items():
+            cached = _FILE_IMPORTS.get(fp)
+            if not cached or cached[0] != content:
+                cached = (content, parse_imports(content))
+                _FILE_IMPORTS[fp] = cached
+            for specifier, names in cached[1]:
+                for target in self._resolve(fp, specifier, names):
+                    if target and target != folder and target in self.folders:
+                        deps.setdefault(target, specifier)
+        self.edges[folder] = deps
+        self.tokens[folder] = sum(estimate_tokens(content) for content in sources.values())
+        return deps
+
+    def closure(self, roots: list, max_depth: int, budget: int = None) -> tuple:
+        """The selected folders plus the components they import, breadth first up to `max_depth` hops.
+        Dependencies that would push the added tokens past `budget` are left out.
+        Returns (folders in selection-then-discovery order, rows for display)"""
+        depth = dict.fromkeys(roots, 0)
+        parent = {}
+        via = {}
+        queue = list(depth)
+        for folder in queue:
+            if depth[folder] >= max_depth:
+                continue
+            for dep, specifier in self.dependencies(folder).items():
+                if dep not in depth:
+                    depth[dep] = depth[folder] + 1
+                    parent[dep] = folder
+                    via[dep] = f"{folder} → {specifier}"
+                    queue.append(dep)
+
+        included = {}
+        used = 0
+        rows = []
+        for folder in queue:
+            if depth[folder]:
+                self.dependencies(folder)  # token count of the leaves
+            cost = self.tokens.get(folder, 0)
+            keep = depth[folder] == 0 or (
+                parent[folder] in included and (budget is None or used + cost <= budget)
+            )
+            if keep:
+                included[folder] = True
+                used += cost if depth[folder] else 0
+            if depth[folder]:
+                rows.append({
+                    "component": folder,
+                    "depth": depth[folder],
+                    "imported by": via[folder],
+                    "tokens": cost,
+                    "included": keep,
+                })
+        self.cache.save()
+        return list(included), rows
+
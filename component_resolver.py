@@ -0,0 +1,165 @@
+# component_resolver.py
+
+
+import os
+import re
+from difflib import SequenceMatcher
+
+from corpus_cache import get_corpus_cache
+from figma_layout import iter_nodes
+
+
+# ====================== COMPONENT INDEX ======================
+
+
+EXPORT_PATTERNS = [
+    re.compile(r"export\s+(?:const|let|function|class)\s+([A-Z]\w*)"),
+    re.compile(r"export\s+default\s+(?:function\s+|class\s+)?([A-Z]\w*)"),
+]
+EXPORT_LIST_PATTERN = re.compile(r"export\s*\{([^}]*)\}")
+
+INDEX_FILES = ("index.tsx", "index.ts", "index.jsx", "index.js")
+
+
+def tokenize_name(name: str) -> list:
+    """Split a component/layer name into lowercase word tokens (handles camel, kebab, snake, slashes, spaces)"""
+    name = re.sub(r"([a-z0-9])([A-Z])", r"\1 \2", name or "")
+    name = re.sub(r"([A-Z]+)([A-Z][a-z])", r"\1 \2", name)
+    return [t for t in re.split(r"[^A-Za-z0-9]+", name.lower()) if t and not t.isdigit()]
+
+
+def extract_exported_names(source: str) -> list:
+    """Return PascalCase names exported from a component entry file"""
+    names = []
+    for pattern in EXPORT_PATTERNS:
+        names.extend(pattern.findall(source))
+    for group in EXPORT_LIST_PATTERN.findall(source):
+        for item in group.split(","):
+            # `Label`, `Label as Text`, `type LabelProperties`
+            item = item.strip().split(" as ")[-1].strip()
+            if item and item[0].isupper():
+                names.append(item)
+    return list(dict.fromkeys(names))
+
+
+def index_components(base_path: str, folders: list) -> list:
+    """Index component folders by folder name and exported component names"""
+    cache = get_corpus_cache(base_path)
+    index = []
+    for folder in folders:
+        path = os.path.join(base_path, folder)
+        exported = []
+        for file in INDEX_FILES:
+            content = cache.read(os.path.join(path, file))
+            if content is not None:
+                exported = extract_exported_names(content)
+                break
+
+        names = [folder] + exported
+        index.append({
+            "folder": folder,
+            "exported": exported,
+            "keys": ["".join(tokenize_name(n)) for n in names],
+            "tokens": [set(tokenize_name(n)) for n in names],
+        })
+    cache.save()
+    return index
+
+
+# ====================== MATCHING ======================
+
+
+def match_name(name: str, index: list, min_token_score: float = 0.5, min_fuzzy_score: float = 0.75):
+    """Match one Figma name against the index: exact → token overlap → fuzzy.
+    Returns (entry, method, score, component) or None – component is the export that matched"""
+    tokens = set(tokenize_name(name))
+    key = "".join(tokenize_name(name))
+    if not key:
+        return None
+
+    # 1. Exact (normalized) match on folder or exported name
+    for entry in index:
+        if key in entry["keys"]:
+            return entry, "exact", 1.0, component_name(entry, entry["keys"].index(key))
+
+    # 2. Token overlap (Jaccard) – "Sticky button" vs "sticky-button-bar"
+    best = None
+    for entry in index:
+        for position, candidate in enumerate(entry["tokens"]):
+            if not candidate:
+                continue
+            score = len(tokens & candidate) / len(tokens | candidate)
+            if score >= min_token_score and (best is None or score > best[2]):
+                best = (entry, "token", round(score, 2), component_name(entry, position))
+    if best:
+        return best
+
+    # 3. Fuzzy character match – typos and abbreviations ("Chkbox" vs "checkbox")
+    for entry in index:
+        for position, candidate in enumerate(entry["keys"]):
+            score = SequenceMatcher(None, key, candidate).ratio()
+            if score >= min_fuzzy_score and (best is None or score > best[2]):
+                best = (entry, "fuzzy", round(score, 2), component_name(entry, position))
+    return best
+
+
+def resolve_node(node: dict, component_names: dict, index: list):
+    """Resolve one INSTANCE node: layer name first, then the component set behind componentId"""
+    candidates = [node.get("name", "").strip(), component_names.get(node.get("componentId"), "")]
+    for candidate in candidates:
+        # "Icon/information-circle" → also try the last path segment
+        for name in (candidate, candidate.split("/")[-1]):
+            result = match_name(name, index)
+            if result:
+                return result
+    return None
+
+
+def resolve_instances(documents: list, component_names: dict, index: list) -> list:
+    """Resolve every Figma INSTANCE to an existing component; returns one row per (instance name, folder)"""
+    rows = {}
+    for document in documents:
+        for node, _ in iter_nodes(document):
+            if node.get("type") != "INSTANCE":
+                continue
+            result = resolve_node(node, component_names, index)
+            if not result:
+                continue
+
+            entry, method, score, component = result
+            instance_name = node.get("name", "").strip()
+            row_key = (instance_name, entry["folder"])
+            if row_key in rows:
+                rows[row_key]["count"] += 1
+                continue
+            rows[row_key] = {
+                "folder": entry["folder"],
+                "instance": instance_name,
+                "component": component,
+                "method": method,
+                "score": score,
+                "count": 1,
+            }
+    return list(rows.values())
+
+
+def component_name(entry: dict, position: int = 0) -> str:
+    """Exported component name behind `entry["keys"][position]` – a folder-name match (position 0) gives the
+    first export, or the folder name in TitleCase if nothing is exported"""
+    if position:
+        return entry["exported"][position - 1]
+    if entry["exported"]:
+        return entry["exported"][0]
+    return "".join(t.capitalize() for t in tokenize_name(entry["folder"]))
+
+
+def build_mapping_rows(resolved: list) -> list:
+    """Format resolved instances as [Component-Folder Name, Component Name, Mapping] rows"""
+    return [
+        [
+            r["folder"],
+            r["instance"],
+            f"<{r['component']}> ×{r['count']} ({r['method']} match, {r['score']})",
+        ]
+        for r in sorted(resolved, key=lambda r: (r["folder"], r["instance"]))
+    ]
@@ -0,0 +1,142 @@
+# component_retrieval.py
+
+
+import math
+import os
+import re
+from collections import Counter, defaultdict
+
+from component_resolver import tokenize_name
+from corpus_cache import get_corpus_cache
+from token_budget import estimate_tokens
+
+
+IDENTIFIER = re.compile(r"[A-Za-z][A-Za-z0-9_\-]*")
+
+# Language keywords and filler words that say nothing about which component is needed
+STOPWORDS = {
+    "import", "export", "from", "const", "let", "var", "return", "function", "default", "type",
+    "interface", "extends", "props", "react", "native", "string", "number", "boolean", "null",
+    "undefined", "true", "false", "new", "this", "else", "void", "any", "async", "await",
+    "the", "and", "for", "with", "that", "should", "will", "user", "when", "then", "given",
+    "are", "can", "has", "have", "not", "all", "into", "its", "our", "per", "via", "see",
+}
+
+# Folder and file names describe a file better than its body – their tokens are counted several times
+PATH_WEIGHT = 3
+
+
+def tokenize_text(text: str) -> list:
+    """Split source code or prose into lowercase word tokens used for ranking"""
+    tokens = []
+    for identifier in IDENTIFIER.findall(text or ""):
+        tokens.extend(t for t in tokenize_name(identifier) if len(t) > 2 and t not in STOPWORDS)
+    return tokens
+
+
+def collect_component_files(base_path: str, folders: list) -> list:
+    """Read every source file of the selected component folders (assets skipped).
+    Unchanged files come from the corpus cache. Returns [{folder, path, content}] with `path` relative to base_path"""
+    cache = get_corpus_cache(base_path)
+    paths = []
+    for folder in folders:
+        path = os.path.join(base_path, folder)
+        if not os.path.isdir(path):
+            continue
+        paths.extend((folder, fp) for fp in cache.folder_sources(folder))
+
+    contents = cache.read_many([fp for _, fp in paths])
+    cache.save()
+    return [{
+        "folder": folder,
+        "path": os.path.relpath(fp, base_path).replace("\\", "/"),
+        "content": contents[fp],
+    } for folder, fp in paths if contents[fp] is not None]
+
+
+class BM25Index:
+    """Okapi BM25 over an inverted index of term → {doc id: term frequency}"""
+
+    def __init__(self, documents: list, k1: float = 1.5, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self.postings = defaultdict(dict)
+        self.lengths = []
+        for doc_id, tokens in enumerate(documents):
+            for term, count in Counter(tokens).items():
+                self.postings[term][doc_id] = count
+            self.lengths.append(len(tokens))
+        self.avg_length = (sum(self.lengths) / len(self.lengths)) if self.lengths else 0.0
+
+    def idf(self, term: str) -> float:
+        n = len(self.lengths)
+        df = len(self.postings.get(term, ()))
+        return math.log(1 + (n - df + 0.5) / (df + 0.5))
+
+    def score(self, query_tokens: list) -> list:
+        """Score every document against the query – only postings of query terms are visited"""
+        scores = [0.0] * len(self.lengths)
+        for term, query_count in Counter(query_tokens).items():
+            postings = self.postings.get(term)
+            if not postings:
+                continue
+            idf = self.idf(term)
+            for doc_id, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self.lengths[doc_id] / (self.avg_length or 1))
+                scores[doc_id] += query_count * idf * tf * (self.k1 + 1) / (tf + norm)
+        return scores
+
+
+def _document_tokens(file: dict) -> list:
+    return tokenize_text(file["path"]) * PATH_WEIGHT + tokenize_text(file["content"])
+
+
+def rank_component_files(files: list, query: str) -> list:
+    """Rank component files by BM25 relevance to the query text. Returns [(score, file)] best first"""
+    index = BM25Index([_document_tokens(f) for f in files])
+    scores = index.score(tokenize_text(query))
+    return sorted(zip(scores, files), key=lambda pair: -pair[0])
+
+
+def select_component_files(files: list, query: str, budget: int) -> tuple:
+    """Keep the most relevant files within a token budget.
+    Every folder first gets its best file (the user picked it), then the rest go by score.
+    Returns (selected files in folder order, rows for display)"""
+    ranked = rank_component_files(files, query)
+    tokens = {f["path"]: estimate_tokens(f["content"]) for f in files}
+
+    best_per_folder = {}
+    for score, file in ranked:
+        best_per_folder.setdefault(file["folder"], file["path"])
+    first = set(best_per_folder.values())
+    order = [pair for pair in ranked if pair[1]["path"] in first] + [pair for pair in ranked if pair[1]["path"] not in first]
+
+    used = 0
+    chosen = set()
+    for _, file in order:
+        cost = tokens[file["path"]]
+        if used + cost <= budget:
+            chosen.add(file["path"])
+            used += cost
+
+    rows = [{
+        "folder": file["folder"],
+        "file": file["path"],
+        "score": round(score, 2),
+        "tokens": tokens[file["path"]],
+        "included": file["path"] in chosen,
+    } for score, file in ranked]
+    selected = [f for f in files if f["path"] in chosen]
+    return selected, rows
+
+
+def render_component_files(files: list) -> str:
+    """Format files in the `// COMPONENT:` / `// path` layout the prompt expects"""
+    result = []
+    current = None
+    for file in files:
+        if file["folder"] != current:
+            current = file["folder"]
+            result.append(f"\n// COMPONENT: {current}\n")
+        result.append(f"// {file['path']}\n{file['content']}\n\n")
+    return "".join(result)
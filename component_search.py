@@ -0,0 +1,74 @@
+# component_search.py
+
+
+from collections import Counter, defaultdict
+
+from component_resolver import tokenize_name
+
+
+# Components shown per picker page (five checkbox columns)
+PICKER_PAGE_SIZE = 50
+
+
+def trigrams(key: str) -> set:
+    """Character trigrams of a name key, padded so short names and word starts still match"""
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+class ComponentSearchIndex:
+    """Trigram index over component folder names and the component names they export.
+    A query only visits postings of its own trigrams, so ranking stays cheap with thousands of folders"""
+
+    def __init__(self, index: list):
+        self.folders = [entry["folder"] for entry in index]
+        self.labels = [[entry["folder"], *entry["exported"]] for entry in index]
+        self.names = []      # key id → (folder id, display name, key, trigram count)
+        self.postings = defaultdict(list)
+        for folder_id, entry in enumerate(index):
+            for name, key in zip([entry["folder"], *entry["exported"]], entry["keys"]):
+                if not key:
+                    continue
+                key_id = len(self.names)
+                grams = trigrams(key)
+                self.names.append((folder_id, name, key, len(grams)))
+                for gram in grams:
+                    self.postings[gram].append(key_id)
+
+    def search(self, query: str) -> list:
+        """Folders ranked by their best matching name: [(folder, matched name, score)].
+        An empty query returns every folder in its original order"""
+        key = "".join(tokenize_name(query))
+        if not key:
+            needle = query.strip().lower()
+            if not needle:
+                return [(folder, folder, 1.0) for folder in self.folders]
+            # Digits and symbols have no name tokens ("2", "-v2") – plain substring match instead
+            matches = []
+            for folder, labels in zip(self.folders, self.labels):
+                name = next((label for label in labels if needle in label.lower()), None)
+                if name:
+                    matches.append((folder, name, 1.0))
+            return matches
+
+        query_grams = trigrams(key)
+        shared = Counter()
+        for gram in query_grams:
+            shared.update(self.postings.get(gram, ()))
+
+        best = {}
+        for key_id, common in shared.items():
+            folder_id, name, name_key, gram_count = self.names[key_id]
+            # Jaccard similarity of the trigram sets, boosted for prefix and substring hits
+            score = common / (len(query_grams) + gram_count - common)
+            if name_key.startswith(key):
+                score += 1.0
+            elif key in name_key:
+                score += 0.5
+            if score > best.get(folder_id, (0.0, ""))[0]:
+                best[folder_id] = (score, name)
+
+        # Loose matches (a shared trigram or two) only pad the list out
+        cutoff = 0.25 if len(key) > 2 else 0.5
+        ranked = sorted(best.items(), key=lambda item: (-item[1][0], self.folders[item[0]]))
+        return [(self.folders[folder_id], name, round(score, 3)) for folder_id, (score, name) in ranked if score >= cutoff]
@@ -0,0 +1,119 @@
+# component_watcher.py
+
+
+import os
+import threading
+import time
+
+try:
+    from watchdog.events import FileSystemEventHandler
+    from watchdog.observers import Observer
+except ImportError:  # watchdog (inotify on Linux) is optional – the watcher polls without it
+    FileSystemEventHandler = object
+    Observer = None
+
+from corpus_cache import get_corpus_cache
+
+
+# Seconds between directory scans when no native file events are available
+POLL_INTERVAL = 30.0
+
+# Seconds between full scans that re-stat every cached file – in events mode they catch missed events
+# (queue overflow, network/WSL drives)
+FILE_SCAN_INTERVAL = 300.0
+
+
+class _EventHandler(FileSystemEventHandler):
+    def __init__(self, watcher):
+        self.watcher = watcher
+
+    def on_any_event(self, event):
+        if event.event_type in ("opened", "closed", "closed_no_write"):
+            return
+        paths = [event.src_path, getattr(event, "dest_path", "")]
+        self.watcher.changed([p for p in paths if p], event.event_type != "modified")
+
+
+class ComponentWatcher:
+    """Keeps the corpus cache of a component library current in the background.
+    While native file events (watchdog/inotify) are flowing they drop changed entries as they happen and the
+    cache trusts its entries without a stat; a full re-stat every FILE_SCAN_INTERVAL catches missed events.
+    Without an observer the cache keeps validating every read itself and the directories are re-stat'ed
+    every `poll_interval` seconds, so added or removed folders still bump `version`"""
+
+    def __init__(self, base_path: str, poll_interval: float = POLL_INTERVAL):
+        self.base_path = os.path.abspath(base_path)
+        self.cache = get_corpus_cache(self.base_path)
+        self.poll_interval = poll_interval
+        self.version = 0      # bumped on every change – derived views compare it to decide on a refresh
+        self.mode = "starting"
+        self._stop = threading.Event()
+        self._observer = None
+        self._thread = threading.Thread(target=self._run, name=f"component-watcher:{self.base_path}", daemon=True)
+        self._thread.start()
+
+    def changed(self, paths: list, structural: bool = True):
+        """Drop the cached entries of changed paths. A modified file or directory drops only its own content
+        or listing; created/deleted/moved ones drop everything under them and their parent's listing"""
+        for path in paths:
+            if structural:
+                self.cache.invalidate(path)
+                self.cache.forget(os.path.dirname(path))
+            else:
+                self.cache.forget(path)
+        self.version += 1
+
+    def folders(self) -> list:
+        """Component folders at the top of the library"""
+        return list(self.cache.listdir(self.base_path)[0])
+
+    def _run(self):
+        if Observer is not None:
+            try:
+                self._observer = Observer()
+                self._observer.schedule(_EventHandler(self), self.base_path, recursive=True)
+                self._observer.start()
+            except OSError:  # e.g. inotify watch limit reached
+                self._observer = None
+
+        # Entries loaded from disk may predate the server – check them once before trusting them
+        if self.cache.revalidate():
+            self.version += 1
+        self.cache.watched = self._observer is not None
+        self.mode = "events" if self._observer else "polling"
+
+        last_file_scan = time.monotonic()
+        while not self._stop.wait(self.poll_interval):
+            if self._observer is not None and not self._observer.is_alive():
+                # Observer thread died – reads go back to validating themselves
+                self._observer = None
+                self.cache.watched = False
+                self.mode = "polling"
+            file_scan = time.monotonic() - last_file_scan >= FILE_SCAN_INTERVAL
+            if file_scan:
+                last_file_scan = time.monotonic()
+            if (self._observer is None or file_scan) and self.cache.revalidate(files=file_scan):
+                self.version += 1
+            self.cache.save()
+
+    def stop(self):
+        self._stop.set()
+        self.cache.watched = False
+        if self._observer is not None:
+            self._observer.stop()
+
+
+_WATCHERS = {}
+_WATCHERS_LOCK = threading.Lock()
+
+
+def get_component_watcher(base_path: str, poll_interval: float = None) -> ComponentWatcher:
+    """One watcher per component library per process (shared by every Streamlit session).
+    A given `poll_interval` also applies to an already running watcher from its next scan"""
+    key = os.path.abspath(base_path)
+    with _WATCHERS_LOCK:
+        if key not in _WATCHERS:
+            _WATCHERS[key] = ComponentWatcher(key, poll_interval or POLL_INTERVAL)
+        elif poll_interval:
+            _WATCHERS[key].poll_interval = poll_interval
+        return _WATCHERS[key]
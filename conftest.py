@@ -0,0 +1,35 @@
+# conftest.py
+
+
+import pytest
+
+import corpus_cache
+from component_resolver import index_components
+
+
+# Component library written to disk for the tests – folder → index.tsx
+COMPONENT_LIBRARY = {
+    "custom-input": (
+        "export const CurrencyComponent = () => null;\n"
+        "export const Input = () => null;\n"
+        "export const PasswordInput = () => null;\n"
+    ),
+    "label": "export const Label = () => null;\n",
+    "sticky-button-bar": "export default {};\n",
+}
+
+
+@pytest.fixture
+def component_library(tmp_path, monkeypatch):
+    """Path of a small component library; the corpus cache is kept under tmp_path"""
+    monkeypatch.setattr(corpus_cache, "DEFAULT_CACHE_DIR", str(tmp_path / "cache"))
+    library = tmp_path / "components"
+    for folder, source in COMPONENT_LIBRARY.items():
+        (library / folder).mkdir(parents=True)
+        (library / folder / "index.tsx").write_text(source, encoding="utf-8")
+    return str(library)
+
+
+@pytest.fixture
+def component_index(component_library):
+    return index_components(component_library, list(COMPONENT_LIBRARY))
@@ -0,0 +1,247 @@
+# corpus_cache.py
+
+
+import hashlib
+import json
+import os
+import posixpath
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "figma2native")
+
+CACHE_VERSION = 1
+
+# Reads are I/O bound (network drives) – threads overlap the latency
+MAX_READ_WORKERS = 16
+
+SOURCE_EXTENSIONS = (".tsx", ".ts", ".jsx", ".js")
+
+
+def strip_blank_lines(text: str) -> str:
+    return "\n".join(l for l in text.splitlines() if l.strip())
+
+
+class CorpusCache:
+    """Stripped file contents and directory listings of one component library, persisted as JSON.
+    Files are keyed by path and re-read only when their mtime or size changes"""
+
+    def __init__(self, base_path: str, cache_dir: str = None):
+        self.base_path = os.path.abspath(base_path)
+        key = hashlib.sha1(self.base_path.encode("utf-8")).hexdigest()[:16]
+        self.cache_file = os.path.join(cache_dir or DEFAULT_CACHE_DIR, f"corpus-{key}.json")
+        self.files = {}   # rel path → [mtime_ns, size, content]
+        self.dirs = {}    # rel dir → [mtime_ns, subdirs, files]
+        self.hits = 0
+        self.misses = 0
+        self.io_seconds = 0.0
+        self.dirty = False
+        self.watched = False  # set by a ComponentWatcher – entries are then trusted without a stat
+        self._parent_mtimes = {}  # rel dir → mtime_ns, for folders of cached files that have no cached listing
+        self.lock = threading.Lock()
+        self._load()
+
+    def _load(self):
+        try:
+            with open(self.cache_file, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        if data.get("version") == CACHE_VERSION and data.get("base_path") == self.base_path:
+            self.files = data.get("files", {})
+            self.dirs = data.get("dirs", {})
+
+    def save(self):
+        """Write the cache back if anything changed (atomic replace). Saves from the watcher thread and
+        Streamlit reruns are serialised, each through its own temporary file"""
+        with self.lock:
+            if not self.dirty:
+                return
+            payload = {"version": CACHE_VERSION, "base_path": self.base_path, "files": self.files, "dirs": self.dirs}
+            tmp = None
+            try:
+                os.makedirs(os.path.dirname(self.cache_file), exist_ok=True)
+                with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=os.path.dirname(self.cache_file),
+                                                 suffix=".tmp", delete=False) as f:
+                    tmp = f.name
+                    json.dump(payload, f)
+                os.replace(tmp, self.cache_file)
+                tmp = None
+                self.dirty = False
+            except OSError:
+                pass
+            finally:
+                if tmp is not None:
+                    try:
+                        os.remove(tmp)
+                    except OSError:
+                        pass
+
+    def _rel(self, path: str) -> str:
+        return os.path.relpath(os.path.abspath(path), self.base_path).replace("\\", "/")
+
+    def listdir(self, path: str) -> tuple:
+        """(subdirs, files) of a directory – reused while the directory's mtime is unchanged"""
+        rel = self._rel(path)
+        entry = self.dirs.get(rel)
+        if entry and self.watched:
+            return entry[1], entry[2]
+        try:
+            mtime = os.stat(path).st_mtime_ns
+        except OSError:
+            return [], []
+        if entry and entry[0] == mtime:
+            return entry[1], entry[2]
+
+        subdirs, files = [], []
+        try:
+            with os.scandir(path) as it:
+                for item in it:
+                    (subdirs if item.is_dir() else files).append(item.name)
+        except OSError:
+            return [], []
+        subdirs.sort()
+        files.sort()
+        with self.lock:
+            self.dirs[rel] = [mtime, subdirs, files]
+            self.dirty = True
+        return subdirs, files
+
+    def walk(self, path: str):
+        """os.walk replacement backed by the cached listings"""
+        stack = [path]
+        while stack:
+            current = stack.pop()
+            subdirs, files = self.listdir(current)
+            yield current, subdirs, files
+            stack.extend(os.path.join(current, d) for d in reversed(subdirs))
+
+    def folder_sources(self, folder: str) -> list:
+        """Source file paths under a component folder (relative to the library or absolute), assets skipped"""
+        paths = []
+        for root, _, names in self.walk(os.path.join(self.base_path, folder)):
+            if "assets" in os.path.basename(root):
+                continue
+            paths.extend(os.path.join(root, name) for name in names if name.endswith(SOURCE_EXTENSIONS))
+        return paths
+
+    def read(self, path: str):
+        """Blank-line-stripped file content; None when unreadable"""
+        rel = self._rel(path)
+        entry = self.files.get(rel)
+        if entry and self.watched:
+            with self.lock:
+                self.hits += 1
+            return entry[2]
+        try:
+            stat = os.stat(path)
+        except OSError:
+            return None
+        if entry and entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+            with self.lock:
+                self.hits += 1
+            return entry[2]
+
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                content = strip_blank_lines(f.read())
+        except Exception:
+            return None
+        with self.lock:
+            self.misses += 1
+            self.files[rel] = [stat.st_mtime_ns, stat.st_size, content]
+            self.dirty = True
+        return content
+
+    def read_many(self, paths: list, workers: int = MAX_READ_WORKERS) -> dict:
+        """Read files concurrently (stat + changed-file reads overlap). Returns {path: content or None}"""
+        start = time.perf_counter()
+        if len(paths) <= 1 or workers <= 1:
+            contents = {path: self.read(path) for path in paths}
+        else:
+            with ThreadPoolExecutor(max_workers=min(workers, len(paths))) as pool:
+                contents = dict(zip(paths, pool.map(self.read, paths)))
+        with self.lock:
+            self.io_seconds += time.perf_counter() - start
+        return contents
+
+    def signature(self, path: str):
+        """(mtime_ns, size) of a file as last read, or None"""
+        entry = self.files.get(self._rel(path))
+        return (entry[0], entry[1]) if entry else None
+
+    def forget(self, path: str):
+        """Drop the cached listing/content of exactly this path"""
+        rel = self._rel(path)
+        with self.lock:
+            for table in (self.files, self.dirs):
+                if table.pop(rel, None) is not None:
+                    self.dirty = True
+
+    def revalidate(self, files: bool = True) -> list:
+        """Stat every cached directory and file; drop the ones changed on disk. Returns the dropped paths.
+        With files=False only directories are stat'ed, plus the files directly inside a changed one
+        (editors save by replacing the file, which touches its directory)"""
+        stale = []
+        for rel, entry in list(self.dirs.items()):
+            path = os.path.join(self.base_path, rel)
+            try:
+                if entry[0] == os.stat(path).st_mtime_ns:
+                    continue
+            except OSError:
+                pass
+            self.forget(path)
+            stale.append(path)
+
+        if files:
+            candidates = list(self.files.items())
+        else:
+            changed_dirs = {self._rel(path) for path in stale}
+            parents = {posixpath.dirname(rel) or "." for rel in list(self.files)}
+            for rel in parents - self.dirs.keys() - changed_dirs:
+                try:
+                    mtime = os.stat(os.path.join(self.base_path, rel)).st_mtime_ns
+                except OSError:
+                    mtime = None
+                if self._parent_mtimes.get(rel, mtime) != mtime:
+                    changed_dirs.add(rel)
+                self._parent_mtimes[rel] = mtime
+            candidates = [(rel, entry) for rel, entry in list(self.files.items())
+                          if (posixpath.dirname(rel) or ".") in changed_dirs]
+        for rel, entry in candidates:
+            path = os.path.join(self.base_path, rel)
+            try:
+                stat = os.stat(path)
+                if entry[0] == stat.st_mtime_ns and entry[1] == stat.st_size:
+                    continue
+            except OSError:
+                pass
+            self.forget(path)
+            stale.append(path)
+        return stale
+
+    def invalidate(self, path: str):
+        """Forget a file or directory (and everything under it)"""
+        rel = self._rel(path)
+        prefix = rel.rstrip("/") + "/"
+        with self.lock:
+            for table in (self.files, self.dirs):
+                for key in [k for k in table if k == rel or k.startswith(prefix)]:
+                    del table[key]
+                    self.dirty = True
+
+
+_CACHES = {}
+_CACHES_LOCK = threading.Lock()
+
+
+def get_corpus_cache(base_path: str) -> CorpusCache:
+    """One cache per component library per process"""
+    key = os.path.abspath(base_path)
+    with _CACHES_LOCK:
+        if key not in _CACHES:
+            _CACHES[key] = CorpusCache(key)
+        return _CACHES[key]
@@ -0,0 +1,208 @@
+# figma_layout.py
+
+
+import json
+import re
+from bisect import bisect_left
+from collections import Counter
+
+
+# ====================== FIGMA JSON LOADING ======================
+
+
+def _iter_payloads(text: str):
+    """Yield each JSON payload from text holding one or several concatenated Figma responses"""
+    decoder = json.JSONDecoder()
+    pos = 0
+    length = len(text)
+
+    while pos < length:
+        # Skip whitespace between concatenated payloads
+        while pos < length and text[pos].isspace():
+            pos += 1
+        if pos >= length:
+            break
+        payload, pos = decoder.raw_decode(text, pos)
+        yield payload
+
+
+def _iter_entries(text: str):
+    """Yield node entries ({document, components, componentSets}) from every payload"""
+    for payload in _iter_payloads(text):
+        if "nodes" in payload:
+            # /v1/files/:key/nodes response
+            for entry in payload["nodes"].values():
+                if entry and "document" in entry:
+                    yield entry
+        elif "document" in payload:
+            # /v1/files/:key response
+            yield payload
+        elif "type" in payload:
+            # Raw node dump
+            yield {"document": payload}
+
+
+def load_figma_documents(text: str) -> list:
+    """Parse Figma API JSON (one or several concatenated payloads) and return the root document nodes"""
+    return [entry["document"] for entry in _iter_entries(text)]
+
+
+def load_figma_component_names(text: str) -> dict:
+    """Map componentId → component set name (falls back to the component's own name)"""
+    names = {}
+    for entry in _iter_entries(text):
+        component_sets = entry.get("componentSets") or {}
+        for component_id, component in (entry.get("components") or {}).items():
+            component_set = component_sets.get(component.get("componentSetId"), {})
+            names[component_id] = component_set.get("name") or component.get("name", "")
+    return names
+
+
+def iter_nodes(node: dict, path: tuple = ()):
+    """Yield (node, path) for the node and all its descendants, depth first"""
+    stack = [(node, path)]
+    while stack:
+        current, current_path = stack.pop()
+        node_path = current_path + (current.get("name", ""),)
+        yield current, node_path
+        children = current.get("children") or []
+        for child in reversed(children):
+            stack.append((child, node_path))
+
+
+# ====================== SPACING SCALE ======================
+
+
+SPACING_KEYS = (
+    "paddingTop",
+    "paddingRight",
+    "paddingBottom",
+    "paddingLeft",
+    "itemSpacing",
+    "counterAxisSpacing",
+)
+
+DEFAULT_SPACING_SCALE = [0, 2, 4, 8, 12, 16, 20, 24, 32, 40, 48, 56, 64]
+
+
+def parse_spacing_scale(text: str) -> list:
+    """Read a spacing scale from a theme file (e.g. `spacing: {'spacing-01': 4, ...}` or `Spacing = [4, 8]`)"""
+    if not text:
+        return []
+
+    # `letterSpacing` is not the scale; a type annotation (`spacing: Record<string, number> = {...}`) is skipped
+    match = re.search(r"(?<![A-Za-z])spacing\w*\s*(?::[^=;\n]*?=|[:=])\s*[\[{]([^\]}]*)[\]}]", text, re.IGNORECASE)
+    if not match:
+        return []
+
+    values = set()
+    for entry in match.group(1).split(","):
+        # Take the value side of `key: value` entries, or the bare number otherwise
+        number = re.search(r"(-?\d+(?:\.\d+)?)\s*$", entry.strip())
+        if number:
+            values.add(float(number.group(1)))
+    return sorted(values)
+
+
+def parse_scale_list(value: str) -> list:
+    """Spacing scale from a comma separated list ("0,4,8" or "0px, 4px, 8px"); empty items are skipped.
+    Raises ValueError on anything that is not a number"""
+    return sorted({float(re.sub(r"px$", "", item.strip(), flags=re.IGNORECASE)) for item in value.split(",") if item.strip()})
+
+
+def derive_spacing_scale(values: list, base: int = 4, min_count: int = 2) -> list:
+    """Derive a project spacing scale from observed values: base-grid steps used at least `min_count` times"""
+    counts = Counter(round(v / base) * base for v in values if v is not None and v >= 0)
+    scale = sorted({0} | {step for step, count in counts.items() if count >= min_count})
+    return scale if len(scale) > 1 else list(DEFAULT_SPACING_SCALE)
+
+
+def snap_values(values: list, scale: list) -> list:
+    """Snap every value to its nearest scale step in one sweep (ties go to the smaller step)"""
+    if not scale:
+        return list(values)
+
+    last = len(scale) - 1
+    snapped = []
+    for value in values:
+        i = bisect_left(scale, value)
+        if i == 0:
+            snapped.append(scale[0])
+        elif i > last:
+            snapped.append(scale[last])
+        else:
+            lower, upper = scale[i - 1], scale[i]
+            snapped.append(upper if upper - value < value - lower else lower)
+    return snapped
+
+
+def collect_spacing(documents: list) -> list:
+    """Collect (node, path, key, value) records for every padding/gap value in the documents"""
+    records = []
+    for document in documents:
+        for node, path in iter_nodes(document):
+            for key in SPACING_KEYS:
+                value = node.get(key)
+                if isinstance(value, (int, float)):
+                    records.append((node, path, key, float(value)))
+    return records
+
+
+def quantize_spacing(documents: list, scale: list = None) -> tuple:
+    """Snap all layout spacing values to the scale; returns (scale, {node_id: {key: snapped}})"""
+    records = collect_spacing(documents)
+    raw_values = [value for _, _, _, value in records]
+
+    if not scale:
+        scale = derive_spacing_scale(raw_values)
+    scale = sorted(scale)
+
+    snapped_values = snap_values(raw_values, scale)
+
+    snapped = {}
+    for (node, _, key, _), value in zip(records, snapped_values):
+        snapped.setdefault(node.get("id"), {})[key] = _format_number(value)
+    return scale, snapped
+
+
+def _format_number(value: float):
+    return int(value) if float(value).is_integer() else round(value, 1)
+
+
+# ====================== LAYOUT SUMMARY ======================
+
+
+def summarize_layout(documents: list, scale: list = None, max_depth: int = 8) -> str:
+    """Build a compact auto-layout summary (direction, snapped gap/padding, rounded size) for the prompt"""
+    scale, snapped = quantize_spacing(documents, scale)
+
+    lines = [f"Spacing scale: {', '.join(str(_format_number(s)) for s in scale)}"]
+
+    for document in documents:
+        for node, path in iter_nodes(document):
+            depth = len(path) - 1
+            if depth > max_depth:
+                continue
+            layout_mode = node.get("layoutMode")
+            if not layout_mode or layout_mode == "NONE":
+                continue
+
+            values = snapped.get(node.get("id"), {})
+            parts = [f"{'  ' * depth}{node.get('name', '')} [{node.get('type', '')}, {layout_mode.lower()}]"]
+
+            if "itemSpacing" in values:
+                parts.append(f"gap={values['itemSpacing']}")
+            if "counterAxisSpacing" in values:
+                parts.append(f"rowGap={values['counterAxisSpacing']}")
+
+            padding = [values.get(k, 0) for k in ("paddingTop", "paddingRight", "paddingBottom", "paddingLeft")]
+            if any(padding):
+                parts.append("padding=" + "/".join(str(p) for p in padding))
+
+            box = node.get("absoluteBoundingBox") or {}
+            if box.get("width") is not None and box.get("height") is not None:
+                parts.append(f"size={round(box['width'])}x{round(box['height'])}")
+
+            lines.append(" ".join(parts))
+
+    return "\n".join(lines)
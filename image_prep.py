@@ -0,0 +1,133 @@
+# image_prep.py
+
+
+import hashlib
+import math
+import threading
+from collections import OrderedDict
+from io import BytesIO
+
+try:
+    from PIL import Image, ImageChops
+except ImportError:  # Pillow ships with Streamlit, but images pass through untouched without it
+    Image = None
+
+
+# Gemini tiles images larger than 384px into square crops; each tile (or small image) costs 258 tokens
+TILE_TOKENS = 258
+SMALL_IMAGE_EDGE = 384
+
+# Longest side after downscaling – beyond this, extra pixels only add tiles
+MAX_EDGE = 1536
+
+# Pixels within this distance of the corner colour count as empty margin
+TRIM_TOLERANCE = 8
+TRIM_PADDING = 8
+
+# Content hash + settings → processed image, least recently used first. Shared by every session,
+# so it is bounded – each entry holds the encoded screenshot
+MAX_CACHED_IMAGES = 32
+_IMAGE_CACHE = OrderedDict()
+_IMAGE_CACHE_LOCK = threading.Lock()
+
+
+def estimate_image_tokens(width: int, height: int) -> int:
+    """Token cost of one image: 258 when both sides ≤ 384px, else 258 per tile of min(w, h) / 1.5"""
+    if width <= SMALL_IMAGE_EDGE and height <= SMALL_IMAGE_EDGE:
+        return TILE_TOKENS
+    unit = max(1, math.floor(min(width, height) / 1.5))
+    return math.ceil(width / unit) * math.ceil(height / unit) * TILE_TOKENS
+
+
+def _flatten(image):
+    """RGBA/palette → RGB over white, so transparent margins trim like white ones"""
+    if image.mode in ("RGBA", "LA") or (image.mode == "P" and "transparency" in image.info):
+        rgba = image.convert("RGBA")
+        background = Image.new("RGB", rgba.size, (255, 255, 255))
+        background.paste(rgba, mask=rgba.split()[-1])
+        return background
+    return image.convert("RGB")
+
+
+def trim_margins(image):
+    """Crop uniform borders (the colour of the top-left pixel), keeping a little padding"""
+    background = Image.new(image.mode, image.size, image.getpixel((0, 0)))
+    diff = ImageChops.difference(image, background).convert("L").point(lambda v: 255 if v > TRIM_TOLERANCE else 0)
+    box = diff.getbbox()
+    if not box:
+        return image
+    left, top, right, bottom = box
+    box = (
+        max(0, left - TRIM_PADDING),
+        max(0, top - TRIM_PADDING),
+        min(image.width, right + TRIM_PADDING),
+        min(image.height, bottom + TRIM_PADDING),
+    )
+    return image.crop(box) if box != (0, 0, image.width, image.height) else image
+
+
+def _encode(image) -> tuple:
+    """Smallest of lossless PNG and high-quality WebP"""
+    candidates = []
+    for fmt, mime_type, options in (("PNG", "image/png", {"optimize": True}), ("WEBP", "image/webp", {"quality": 90, "method": 4})):
+        buffer = BytesIO()
+        try:
+            image.save(buffer, fmt, **options)
+        except (OSError, KeyError):
+            continue  # Pillow built without this encoder
+        candidates.append((buffer.getvalue(), mime_type))
+    return min(candidates, key=lambda c: len(c[0]))
+
+
+def _cached(key, result=None):
+    """LRU lookup, or store `result` (evicting the oldest entries beyond MAX_CACHED_IMAGES)"""
+    with _IMAGE_CACHE_LOCK:
+        if result is None:
+            if key in _IMAGE_CACHE:
+                _IMAGE_CACHE.move_to_end(key)
+            return _IMAGE_CACHE.get(key)
+        _IMAGE_CACHE[key] = result
+        _IMAGE_CACHE.move_to_end(key)
+        while len(_IMAGE_CACHE) > MAX_CACHED_IMAGES:
+            _IMAGE_CACHE.popitem(last=False)
+        return result
+
+
+def preprocess_image(data: bytes, mime_type: str, max_edge: int = MAX_EDGE, trim: bool = True) -> dict:
+    """Downscale, trim empty margins and re-encode an image; results are cached by content hash.
+    Returns {data, mime_type, size, original_size, original_bytes, tokens}"""
+    key = (hashlib.sha256(data).hexdigest(), max_edge, trim)
+    cached = _cached(key)
+    if cached is not None:
+        return cached
+
+    result = {"data": data, "mime_type": mime_type, "size": None, "original_size": None,
+              "original_bytes": len(data), "tokens": TILE_TOKENS}
+    if Image is None:
+        return _cached(key, result)
+
+    try:
+        with Image.open(BytesIO(data)) as original:
+            original_size = original.size
+            image = _flatten(original)
+    except (OSError, ValueError):
+        return _cached(key, result)
+
+    if trim:
+        image = trim_margins(image)
+    scale = max_edge / max(image.size)
+    if scale < 1:
+        image = image.resize((max(1, round(image.width * scale)), max(1, round(image.height * scale))), Image.LANCZOS)
+
+    encoded, encoded_type = _encode(image)
+    if len(encoded) >= len(data) and image.size == original_size:
+        encoded, encoded_type = data, mime_type  # Nothing gained – keep the upload as is
+
+    result.update({
+        "data": encoded,
+        "mime_type": encoded_type,
+        "size": image.size,
+        "original_size": original_size,
+        "tokens": estimate_image_tokens(*image.size),
+    })
+    return _cached(key, result)
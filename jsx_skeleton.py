@@ -0,0 +1,226 @@
+# jsx_skeleton.py
+
+
+import re
+
+from component_resolver import resolve_node
+from figma_layout import quantize_spacing
+from translation_extractor import to_title_case
+
+
+# Layers that only draw (icons, shapes) – never rendered as Views
+GRAPHIC_TYPES = {"VECTOR", "GROUP", "RECTANGLE", "ELLIPSE", "LINE", "STAR", "POLYGON", "BOOLEAN_OPERATION"}
+
+CONTAINER_TYPES = {"FRAME", "COMPONENT", "COMPONENT_SET", "INSTANCE", "SECTION"}
+
+# Roots of a whole-file (/v1/files) payload – the screens are the frames inside their pages
+PAGE_TYPES = {"DOCUMENT", "CANVAS"}
+
+MAX_ID_WORDS = 4
+
+
+def _camel_case(text: str) -> str:
+    title = to_title_case(text) or "container"
+    return title[0].lower() + title[1:]
+
+
+def _first_text(node: dict) -> str:
+    """Characters of the first TEXT layer with letters under the node"""
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if current.get("type") == "TEXT" and re.search(r"[A-Za-z]", current.get("characters") or ""):
+            return current["characters"]
+        stack.extend(reversed(current.get("children") or []))
+    return ""
+
+
+def _texts(node: dict) -> list:
+    """Characters of every TEXT layer under the node, in document order"""
+    found = []
+    stack = [node]
+    while stack:
+        current = stack.pop()
+        if current.get("type") == "TEXT":
+            found.append(" ".join((current.get("characters") or "").split()))
+        stack.extend(reversed(current.get("children") or []))
+    return found
+
+
+def _screens(documents: list) -> list:
+    """Screen roots: node payloads as they are, DOCUMENT/CANVAS roots replaced by the frames on their pages"""
+    screens = []
+    stack = list(reversed(documents))
+    while stack:
+        node = stack.pop()
+        if node.get("type") in PAGE_TYPES:
+            stack.extend(reversed([child for child in node.get("children") or [] if child.get("visible") is not False]))
+        else:
+            screens.append(node)
+    return screens
+
+
+class _SkeletonBuilder:
+    """Walks one Figma frame tree and emits JSX lines plus style stubs"""
+
+    def __init__(self, component_names, index, translation_keys, snapped):
+        self.component_names = component_names
+        self.index = index
+        self.translation_keys = translation_keys
+        self.snapped = snapped
+        self.label = "Label" if any("Label" in e["exported"] for e in index) else None
+        self.used_ids = set()
+        self.used_styles = {}
+        self.components = []
+        self.uses_text = False
+        self.lines = []
+
+    def unique(self, name: str, used) -> str:
+        candidate, suffix = name, 2
+        while candidate in used:
+            candidate = f"{name}{suffix}"
+            suffix += 1
+        return candidate
+
+    def component_id(self, component: str, field: str) -> str:
+        """`ComponentNameFieldName` – TitleCase, no separators, unique per screen"""
+        component_id = self.unique(component + (to_title_case(field, MAX_ID_WORDS) or "Item"), self.used_ids)
+        self.used_ids.add(component_id)
+        return component_id
+
+    def style_name(self, node: dict) -> str:
+        name = self.unique(_camel_case(node.get("name", "")), self.used_styles)
+        self.used_styles[name] = self.style_for(node)
+        return name
+
+    def style_for(self, node: dict) -> dict:
+        style = {}
+        layout_mode = node.get("layoutMode")
+        if layout_mode == "HORIZONTAL":
+            style["flexDirection"] = "'row'"
+        elif layout_mode == "VERTICAL":
+            style["flexDirection"] = "'column'"
+
+        values = self.snapped.get(node.get("id"), {})
+        if values.get("itemSpacing"):
+            style["gap"] = values["itemSpacing"]
+
+        top, right, bottom, left = (values.get(k, 0) for k in ("paddingTop", "paddingRight", "paddingBottom", "paddingLeft"))
+        if left == right and left:
+            style["paddingHorizontal"] = left
+        else:
+            if left:
+                style["paddingLeft"] = left
+            if right:
+                style["paddingRight"] = right
+        if top == bottom and top:
+            style["paddingVertical"] = top
+        else:
+            if top:
+                style["paddingTop"] = top
+            if bottom:
+                style["paddingBottom"] = bottom
+        return style
+
+    def add_component(self, name: str):
+        if name not in self.components:
+            self.components.append(name)
+
+    def key_for(self, text: str) -> str:
+        key = self.translation_keys.get(text)
+        return f"t('{key}')" if key else repr(text)
+
+    def emit(self, node: dict, depth: int):
+        indent = "  " * depth
+        node_type = node.get("type")
+
+        if node.get("visible") is False or node_type in GRAPHIC_TYPES:
+            return
+
+        if node_type == "TEXT":
+            text = " ".join((node.get("characters") or "").split())
+            if not text:
+                return
+            if self.label:
+                self.add_component(self.label)
+                label_id = self.component_id(self.label, text if re.search(r"[A-Za-z]", text) else node.get("name", ""))
+                self.lines.append(f'{indent}<{self.label} id="{label_id}" text={{{self.key_for(text)}}} />')
+            else:
+                self.uses_text = True
+                self.lines.append(f"{indent}<Text>{{{self.key_for(text)}}}</Text>")
+            return
+
+        if node_type == "INSTANCE":
+            result = resolve_node(node, self.component_names, self.index)
+            if result:
+                # Resolved components are self-contained – texts go in as props
+                component = result[3]
+                self.add_component(component)
+                component_id = self.component_id(component, _first_text(node) or node.get("name", ""))
+                texts = [self.key_for(t) for t in _texts(node) if re.search(r"[A-Za-z]", t)]
+                hint = f" /* texts: {', '.join(dict.fromkeys(texts))} */" if texts else ""
+                self.lines.append(f'{indent}<{component} id="{component_id}"{hint} />')
+                return
+
+        if node_type not in CONTAINER_TYPES:
+            return
+
+        start = len(self.lines)
+        self.lines.append(None)  # opening tag, filled in once children are known
+        for child in node.get("children") or []:
+            self.emit(child, depth + 1)
+
+        if len(self.lines) == start + 1:
+            # Nothing renderable inside (icon, illustration) – leave a marker for the model
+            self.lines[start] = f"{indent}{{/* Figma: {node.get('name', '').strip()} */}}"
+            return
+
+        self.lines[start] = f"{indent}<View style={{styles.{self.style_name(node)}}}>"
+        self.lines.append(f"{indent}</View>")
+
+
+def _format_styles(styles: dict) -> str:
+    lines = []
+    for name, values in styles.items():
+        body = ", ".join(f"{k}: {v}" for k, v in values.items())
+        lines.append(f"  {name}: {{{body}}},")
+    return "\n".join(lines)
+
+
+def build_view_skeleton(documents: list, component_names: dict, index: list, translations: list, scale: list = None) -> str:
+    """Generate the index.tsx JSX skeleton and style stubs from the Figma frame tree"""
+    if not documents:
+        return "None"
+
+    _, snapped = quantize_spacing(documents, scale)
+    translation_keys = {}
+    for key, text in translations or []:
+        translation_keys.setdefault(text, key)
+
+    builder = _SkeletonBuilder(component_names, index, translation_keys, snapped)
+    screens = _screens(documents)
+    # Several screens in one payload need a fragment around them
+    depth = 3 if len(screens) > 1 else 2
+    for screen in screens:
+        builder.emit(screen, depth)
+    if not builder.lines:
+        return "None"  # Nothing renderable – an empty body would only mislead the model
+    body = builder.lines
+    if len(screens) > 1:
+        body = ["    <>", *body, "    </>"]
+
+    imports = ["import {Text, View} from 'react-native';" if builder.uses_text else "import {View} from 'react-native';"]
+    if builder.components:
+        imports.append(f"import {{{', '.join(sorted(builder.components))}}} from '@app/components';")
+
+    return "\n".join([
+        "// index.tsx – JSX structure",
+        *imports,
+        "",
+        "  return (",
+        *body,
+        "  );",
+        "",
+        "// styles.ts – layout keys (spacing snapped to the project scale)",
+        _format_styles(builder.used_styles),
+    ])
@@ -0,0 +1,79 @@
+# project_export.py
+
+
+import hashlib
+import os
+import shutil
+import time
+import zipfile
+from io import BytesIO
+
+
+# zlib level used when none is chosen – 6 is zlib's own default balance of speed and size
+DEFAULT_COMPRESSION_LEVEL = 6
+
+
+def build_project_zip(files: list, compression_level: int = DEFAULT_COMPRESSION_LEVEL, zip64: bool = True) -> bytes:
+    """Write [(path, content)] straight into an in-memory ZIP – no temporary files.
+    Level 0 stores the files uncompressed; zip64=False refuses archives beyond the classic 4 GB / 65535-entry limits"""
+    method = zipfile.ZIP_DEFLATED if compression_level else zipfile.ZIP_STORED
+    timestamp = time.localtime()[:6]
+    buffer = BytesIO()
+    with zipfile.ZipFile(buffer, "w", method, allowZip64=zip64, compresslevel=compression_level or None) as z:
+        for path, content in files:
+            info = zipfile.ZipInfo(path.replace("\\", "/").lstrip("/"), date_time=timestamp)
+            info.compress_type = method
+            info.external_attr = 0o644 << 16
+            z.writestr(info, content.encode("utf-8"), compresslevel=compression_level or None)
+    return buffer.getvalue()
+
+
+def write_to_project(files: list, target_dir: str) -> list:
+    """Write [(path, content)] into a local project checkout, touching only files whose content changed.
+    Unchanged files keep their mtime, so Metro/TypeScript watchers only rebuild what was regenerated.
+    Returns rows [{file, status, bytes, sha256, message}] with status added / updated / unchanged / rejected / error.
+    A file that cannot be written (a directory in its place, no permission) is reported and the rest still go out"""
+    root = os.path.realpath(target_dir)
+    rows = []
+    for path, content in files:
+        data = content.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        full_path = os.path.realpath(os.path.join(root, path.replace("\\", "/").lstrip("/")))
+        row = {"file": path, "status": "", "bytes": len(data), "sha256": digest[:12], "message": ""}
+        rows.append(row)
+        if os.path.commonpath([root, full_path]) != root:
+            row["status"] = "rejected"  # `../` outside the project
+            continue
+
+        tmp = None
+        try:
+            try:
+                # A size mismatch settles it without reading the file
+                if os.path.getsize(full_path) == len(data):
+                    with open(full_path, 'rb') as f:
+                        if hashlib.sha256(f.read()).hexdigest() == digest:
+                            row["status"] = "unchanged"
+                            continue
+                row["status"] = "updated"
+            except FileNotFoundError:
+                row["status"] = "added"
+
+            # Atomic replace – a watcher never sees a half-written file
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            tmp = f"{full_path}.{os.getpid()}.tmp"
+            with open(tmp, 'wb') as f:
+                f.write(data)
+            if row["status"] == "updated":
+                shutil.copymode(full_path, tmp)
+            os.replace(tmp, full_path)
+            tmp = None
+        except OSError as e:
+            row["status"] = "error"
+            row["message"] = e.strerror or str(e)
+        finally:
+            if tmp is not None:
+                try:
+                    os.remove(tmp)
+                except OSError:
+                    pass
+    return rows
@@ -0,0 +1,113 @@
+# prompt_dedup.py
+
+
+import re
+
+from prompt_templates import slot_tier
+from token_budget import estimate_tokens
+
+
+# Consecutive meaningful lines per shingle – shorter runs are too likely to repeat by chance
+SHINGLE_LINES = 4
+
+# Shorter repeated runs are left in place – cutting them would leave fragments of code behind
+MIN_RUN_LINES = 6
+
+# Lines like `}`, `);`, `---` carry no content on their own
+TRIVIAL_LINE = re.compile(r"^[\W_]{0,3}$")
+
+# Later sections lose their duplicate runs; the template's own instructions are always kept.
+# Per-project sections always come first: deduplicated against per-screen text they would change with every screen
+DEDUP_ORDER = (
+    "conventions_and_standards",
+    "package_structure",
+    "api_endpoints",
+    "sample_code",
+    "user_stories_file_content",
+)
+
+
+def _normalize(line: str) -> str:
+    return " ".join(line.split())
+
+
+def _meaningful_lines(text: str) -> list:
+    """[(line index, normalized line)] for lines that are not blank or bare punctuation"""
+    lines = []
+    for i, line in enumerate(text.split("\n")):
+        normalized = _normalize(line)
+        if normalized and not TRIVIAL_LINE.match(normalized):
+            lines.append((i, normalized))
+    return lines
+
+
+def shingles(text: str, size: int = SHINGLE_LINES) -> set:
+    """Hashes of every window of `size` consecutive meaningful lines"""
+    lines = [line for _, line in _meaningful_lines(text)]
+    return {hash(tuple(lines[i:i + size])) for i in range(len(lines) - size + 1)}
+
+
+def remove_seen_runs(text: str, seen: dict, size: int = SHINGLE_LINES) -> tuple:
+    """Drop runs of lines whose shingles were already emitted elsewhere.
+    `seen` maps shingle hash → source name. Returns (text, removed line count, sources)"""
+    meaningful = _meaningful_lines(text)
+    covered = [False] * len(meaningful)
+    sources = []
+    for i in range(len(meaningful) - size + 1):
+        source = seen.get(hash(tuple(line for _, line in meaningful[i:i + size])))
+        if source:
+            covered[i:i + size] = [True] * size
+            if source not in sources:
+                sources.append(source)
+    if not any(covered):
+        return text, 0, []
+
+    lines = text.split("\n")
+    drop = set()
+    marker_at = {}
+    run_start = None
+    for k, is_covered in enumerate(covered + [False]):
+        if is_covered and run_start is None:
+            run_start = k
+        elif not is_covered and run_start is not None and k - run_start < MIN_RUN_LINES:
+            run_start = None
+        elif not is_covered and run_start is not None:
+            # The run spans from its first to its last meaningful line, trivial lines in between included
+            first, last = meaningful[run_start][0], meaningful[k - 1][0]
+            drop.update(range(first, last + 1))
+            marker_at[first] = last - first + 1
+            run_start = None
+
+    result = []
+    for i, line in enumerate(lines):
+        if i in marker_at:
+            indent = line[:len(line) - len(line.lstrip())]
+            result.append(f"{indent}// [{marker_at[i]} lines omitted – repeated from an earlier section]")
+        if i not in drop:
+            result.append(line)
+    return "\n".join(result), len(drop), sources
+
+
+def deduplicate_sections(sections: dict, static_text: str, order: tuple = DEDUP_ORDER) -> tuple:
+    """Emit every repeated paragraph/code block once across the prompt inputs. Per-project sections are only
+    checked against the instructions and each other, so the stable prompt prefix stays the same across screens.
+    Returns (sections, rows) – rows report the lines and tokens saved per section"""
+    seen = dict.fromkeys(shingles(static_text), "prompt instructions")
+    result = dict(sections)
+    rows = []
+    for name in sorted(order, key=slot_tier):
+        text = sections.get(name)
+        if not isinstance(text, str) or not text.strip() or text == "None":
+            continue
+        deduped, removed, sources = remove_seen_runs(text, seen)
+        for shingle in shingles(text):
+            seen.setdefault(shingle, name)
+        if removed:
+            result[name] = deduped
+            rows.append({
+                "section": name,
+                "lines removed": removed,
+                "tokens saved": estimate_tokens(text) - estimate_tokens(deduped),
+                "repeated from": ", ".join(sources),
+            })
+    return result, rows
@@ -0,0 +1,216 @@
+# prompt_templates.py
+
+
+import argparse
+import ast
+import hashlib
+import os
+import re
+from functools import lru_cache
+
+
+# Placeholders filled by the app – every other `{...}` in the prompts is literal example code
+GENERATE_SLOTS = (
+    "conventions_and_standards",
+    "component_mapping",
+    "existing_components",
+    "user_stories_file_content",
+    "sample_code",
+    "package_structure",
+    "api_endpoints",
+    "figma_layout_summary",
+    "pregenerated_translations",
+    "view_skeleton",
+)
+
+ENRICH_SLOTS = (
+    "iteration_number",
+    "part_number",
+    "total_parts",
+    "current_code",
+    "figma_json_chunk",
+    "theme_colors_content",
+    "figma_layout_summary",
+)
+
+# How often each slot changes: 1 = per project, anything unlisted = per screen/call.
+# existing_components and sample_code are picked for each screen (component context, sample selection)
+PROJECT_SLOTS = {
+    "conventions_and_standards",
+    "package_structure",
+    "api_endpoints",
+    "theme_colors_content",
+}
+
+LAYOUTS = ("original", "cache-friendly")
+
+# Prompt version → module file next to this one (newest first). Files are parsed, never imported
+PROMPT_VERSIONS = {
+    "current": "prompts.py",
+    "v3": "prompts_3.py",
+    "v2": "prompts_2.py",
+    "v1": "prompts_1.py",
+}
+
+# Prompt name → (constant in the module, slots the app can fill)
+PROMPT_NAMES = {
+    "generate": ("GENERATE_PROMPT", GENERATE_SLOTS),
+    "enrich": ("ENRICH_PROMPT", ENRICH_SLOTS),
+}
+
+
+def slot_tier(name: str) -> int:
+    return 1 if name in PROJECT_SLOTS else 2
+
+
+def split_sections(text: str) -> list:
+    """Split a prompt at `## ` headings (outside code fences); the preamble is the first section"""
+    sections = [[]]
+    in_fence = False
+    for line in text.splitlines(keepends=True):
+        if line.lstrip().startswith("```"):
+            in_fence = not in_fence
+        if line.startswith("## ") and not in_fence:
+            sections.append([])
+        sections[-1].append(line)
+    return ["".join(lines) for lines in sections if lines]
+
+
+def cache_friendly_layout(text: str, slot_names: tuple) -> str:
+    """Reorder sections: static instructions → per-project context → per-screen data (original order within each tier)"""
+    tiers = {0: [], 1: [], 2: []}
+    for section in split_sections(text):
+        found = [slot_tier(name) for name in slot_names if "{" + name + "}" in section]
+        tiers[max(found, default=0)].append(section)
+    return "".join(tiers[0] + tiers[1] + tiers[2])
+
+
+def prefix_hash(text: str) -> str:
+    """Short fingerprint of a prompt prefix – equal hashes mean the provider can reuse its cache"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()[:12]
+
+
+class PromptTemplate:
+    """Prompt pre-split into literal segments and named slots; rendering is a single join"""
+
+    def __init__(self, text: str, slot_names: tuple, version: str = ""):
+        self.version = version
+        pattern = re.compile("|".join(re.escape("{" + name + "}") for name in slot_names))
+        self.parts = []
+        self.slot_positions = []
+        pos = 0
+        for match in pattern.finditer(text):
+            self.parts.append(text[pos:match.start()])
+            self.slot_positions.append((len(self.parts), match.group(0)[1:-1]))
+            self.parts.append(None)
+            pos = match.end()
+        self.parts.append(text[pos:])
+        self.slots = frozenset(name for _, name in self.slot_positions)
+        self.static_text = "".join(part for part in self.parts if part is not None)
+        # Everything before the first per-screen slot renders identically across screens of a project
+        self.prefix_end = next(
+            (index for index, name in self.slot_positions if slot_tier(name) > 1), len(self.parts)
+        )
+
+    def transform(self, func) -> "PromptTemplate":
+        """Copy with `func` applied once to every literal segment (e.g. masking); slots are unchanged"""
+        template = object.__new__(PromptTemplate)
+        template.version = self.version
+        template.parts = [part if part is None else func(part) for part in self.parts]
+        template.slot_positions = self.slot_positions
+        template.slots = self.slots
+        template.static_text = "".join(part for part in template.parts if part is not None)
+        template.prefix_end = self.prefix_end
+        return template
+
+    def _fill(self, values: dict) -> list:
+        missing = self.slots - values.keys()
+        if missing:
+            raise ValueError(f"Missing prompt values: {', '.join(sorted(missing))}")
+        unknown = values.keys() - self.slots
+        if unknown:
+            raise ValueError(f"Unknown prompt placeholders: {', '.join(sorted(unknown))}")
+
+        parts = list(self.parts)
+        for index, name in self.slot_positions:
+            parts[index] = str(values[name])
+        return parts
+
+    def select(self, values: dict) -> dict:
+        """Keep only the values this template has slots for (older prompt versions have fewer)"""
+        return {name: value for name, value in values.items() if name in self.slots}
+
+    def render(self, **values) -> str:
+        """Fill every slot exactly once; substituted content is never rescanned for placeholders"""
+        return "".join(self._fill(values))
+
+    def render_split(self, **values) -> tuple:
+        """Render as (stable prefix, per-screen remainder)"""
+        parts = self._fill(values)
+        return "".join(parts[:self.prefix_end]), "".join(parts[self.prefix_end:])
+
+
+# ====================== REGISTRY ======================
+
+
+def _prompt_path(version: str) -> str:
+    if version not in PROMPT_VERSIONS:
+        raise ValueError(f"Unknown prompt version: {version}")
+    return os.path.join(os.path.dirname(os.path.abspath(__file__)), PROMPT_VERSIONS[version])
+
+
+@lru_cache(maxsize=8)
+def _read_prompt_constants(path: str, mtime_ns: int) -> dict:
+    """Top-level string constants of a prompts module, read with ast (the module is not executed)"""
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+    constants = {}
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and isinstance(node.value, ast.Constant) and isinstance(node.value.value, str):
+            for target in node.targets:
+                if isinstance(target, ast.Name):
+                    constants[target.id] = node.value.value
+    return constants
+
+
+@lru_cache(maxsize=32)
+def _compile_prompt(name: str, version: str, layout: str, path: str, mtime_ns: int) -> PromptTemplate:
+    constant, slot_names = PROMPT_NAMES[name]
+    text = _read_prompt_constants(path, mtime_ns).get(constant)
+    if text is None:
+        raise ValueError(f"{os.path.basename(path)} has no {constant}")
+    if layout == "cache-friendly":
+        text = cache_friendly_layout(text, slot_names)
+    digest = hashlib.sha256(text.encode("utf-8")).hexdigest()[:8]
+    return PromptTemplate(text, slot_names, version=f"{name}@{version}:{digest}")
+
+
+def get_prompt_template(name: str, version: str = "current", layout: str = "original") -> PromptTemplate:
+    """Load and precompile a prompt by name and version on first use.
+    Edited prompt files are picked up on the next call (cache keyed by mtime)"""
+    if name not in PROMPT_NAMES:
+        raise ValueError(f"Unknown prompt: {name}")
+    path = _prompt_path(version)
+    return _compile_prompt(name, version, layout, path, os.stat(path).st_mtime_ns)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="List prompt versions or render one with empty slots")
+    parser.add_argument("--name", choices=PROMPT_NAMES, help="Prompt to print")
+    parser.add_argument("--version", default="current", choices=PROMPT_VERSIONS)
+    parser.add_argument("--layout", default="original", choices=LAYOUTS)
+    args = parser.parse_args()
+
+    if args.name:
+        template = get_prompt_template(args.name, args.version, args.layout)
+        print(template.render(**{slot: f"<{slot}>" for slot in template.slots}))
+        return
+
+    for version in PROMPT_VERSIONS:
+        for name in PROMPT_NAMES:
+            template = get_prompt_template(name, version)
+            print(f"{template.version:<28} slots: {', '.join(sorted(template.slots))}")
+
+
+if __name__ == "__main__":
+    main()
@@ -700,6 +700,39 @@ listContainer: {
 - [ ] Use alignItems for cross axis alignment
 - [ ] Test that layout matches Figma design structure
 
+
+### Figma Layout Summary
+
+Auto-layout frames extracted from the Figma API data. Gap and padding values are already snapped to the project spacing scale - use them as-is instead of re-deriving numbers from the image.
+
+{figma_layout_summary}
+
+---
+
+## PRE-GENERATED TRANSLATIONS
+
+The English translation keys and values below were extracted from the Figma text layers and are FIXED inputs:
+
+- Use these keys verbatim in `t('...')` calls – do not rename them or invent alternative keys for the same text
+- In `translations.ts`, do NOT re-type these `en` entries; write the single line `// @pregenerated-en` as the first line inside `export const en = {` (the entries are inserted there automatically) and list only extra keys for text not covered here after it
+- Still output the full `ar` object with all keys (pre-generated and extra)
+- If this section is `None`, generate `translations.ts` as usual
+
+{pregenerated_translations}
+
+---
+
+## VIEW SKELETON
+
+The JSX structure below was generated from the Figma frame tree. Nesting, existing components and component IDs (`ComponentNameFieldName`) are already resolved:
+
+- Use it as the `return (...)` body of `index.tsx` – keep the nesting, components and IDs
+- Fill in props, hook values, handlers and translations; replace `/* texts: ... */` hints with the matching props and `{/* Figma: ... */}` markers with icons/assets or remove them
+- Use the listed style keys in `styles.ts` with the given layout values, then add colors/typography
+- If this section is `None`, derive the structure from the design image as usual
+
+{view_skeleton}
+
 ---
 
 ## NAMING CONVENTIONS & STANDARDS
@@ -845,6 +878,7 @@ When analyzing the attached Figma design image:
 
 **Usage Instructions:**
 - Review all provided component definitions (props, types, usage patterns).
+- When a component is given as a digest (exports, props types, enums, defaults, `// usage:` line), use only the listed props – never invent new ones.
 - Match each Figma element to the closest existing component by purpose and behavior.
 - Use these components instead of creating new ones.
 - Import components directly: `import {ScreenContainer, Label, Input, SubmitButton} from '@app/components'`.
@@ -1313,6 +1347,7 @@ marginBottom: 12,
 - `paddingLeft`, `paddingRight`, `paddingTop`, `paddingBottom` → Use number literals
 - `itemSpacing` (gap between flex children)
 - `layoutMode` (HORIZONTAL → flexDirection: 'row', VERTICAL → flexDirection: 'column')
+- Prefer the snapped gap/padding values from the **Figma Layout Summary** over raw JSON values
 - `primaryAxisAlignItems` (justifyContent)
 - `counterAxisAlignItems` (alignItems)
 - `layoutGrow` (flex grow)
@@ -1827,6 +1862,10 @@ After enrichment, verify:
 {current_code}
 
 
+**Figma Layout Summary (full screen, spacing snapped to the project scale):**
+{figma_layout_summary}
+
+
 **Figma API JSON Data (Part {part_number}):**
 {figma_json_chunk}
 
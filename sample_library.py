@@ -0,0 +1,161 @@
+# sample_library.py
+
+
+import math
+import os
+import re
+
+from bundle_parser import parse_bundle, render_bundle
+from figma_layout import iter_nodes
+from token_budget import estimate_tokens
+
+
+# Screen traits: (patterns that show the trait in sample code, patterns that ask for it in designs/stories)
+TRAITS = {
+    "form": (
+        r"<(?:Input|Dropdown|CustomCheckbox|CustomRadioButton|DatePicker)\b|useForm|yup\.|zod\.|-schema",
+        r"\b(?:input|field|enter|select|checkbox|radio|form|dropdown|placeholder|mandatory|fill)\w*",
+    ),
+    "list": (
+        r"<(?:FlatList|SectionList)\b|\.map\(\s*\(?\w+",
+        r"\b(?:list|items?|history|transactions?|cards|rows?|accounts)\b",
+    ),
+    "review": (
+        r"\b(?:Summary|Review|Confirm\w*|Details?Row|Divider)\b",
+        r"\b(?:review|summary|confirm\w*|consent|edit)\b",
+    ),
+    "calculator": (
+        r"\b(?:amount|installment|calculate\w*|Slider|currency|tenure|percentage)\b",
+        r"\b(?:amount|installments?|calculat\w+|slider|tenure|emi|limit|sar)\b",
+    ),
+    "success": (
+        r"\b(?:Success|Done|Completed?)\w*",
+        r"\b(?:success\w*|done|completed?|congratulations)\b",
+    ),
+    "onboarding": (
+        r"\b(?:GetStarted|Onboarding|Stepper|Steps?)\b",
+        r"\b(?:get started|onboard\w*|steps?|apply|introduction)\b",
+    ),
+    "api": (
+        r"\b(?:use\w*(?:Query|Mutation)|createApi|fetchBaseQuery|builder\.(?:query|mutation)|axios|fetch|queryKey|mutationFn)\b",
+        r"\b(?:api|endpoint|system should|fetch\w*|validate\w*|status)\b",
+    ),
+}
+
+SAMPLE_TRAITS = {name: re.compile(code, re.IGNORECASE) for name, (code, _) in TRAITS.items()}
+REQUEST_TRAITS = {name: re.compile(text, re.IGNORECASE) for name, (_, text) in TRAITS.items()}
+
+SCREEN_ENTRY = re.compile(r"(^|/)index\.(tsx|jsx)$")
+PREAMBLE_PATH = re.compile(r"^\s*/+\s*(app[\\/][^\s]+)", re.MULTILINE)
+
+
+def trait_vector(text: str, patterns: dict) -> dict:
+    """Trait → log-scaled match count"""
+    vector = {}
+    for name, pattern in patterns.items():
+        count = sum(1 for _ in pattern.finditer(text or ""))
+        if count:
+            vector[name] = math.log1p(count)
+    return vector
+
+
+def cosine(a: dict, b: dict) -> float:
+    dot = sum(value * b.get(name, 0.0) for name, value in a.items())
+    norm = math.sqrt(sum(v * v for v in a.values())) * math.sqrt(sum(v * v for v in b.values()))
+    return dot / norm if norm else 0.0
+
+
+def _group_key(path: str) -> str:
+    """Files of one sample screen share their first two path segments"""
+    parts = [p for p in re.split(r"[\\/]", path) if p]
+    return "/".join(parts[:2]) if len(parts) > 2 else "/".join(parts[:-1]) or path
+
+
+def split_samples(text: str, source: str = "sample") -> list:
+    """Split sample code into screens: [{name, files, traits, tokens, screen}]"""
+    groups = {}
+    first_marker = text.find("###FilePath:")
+    preamble = text[:first_marker] if first_marker >= 0 else text
+    if preamble.strip():
+        # Free-form sample without markers – named after the folder of its first `// app\...` path comment
+        match = PREAMBLE_PATH.search(preamble)
+        path = match.group(1).replace("\\", "/") if match else f"{source}/index.tsx"
+        groups[path.rsplit("/", 1)[0]] = [(path, preamble.strip())]
+
+    for path, content in parse_bundle(text):
+        groups.setdefault(_group_key(path), []).append((path, content))
+
+    samples = []
+    for name, group_files in groups.items():
+        body = "\n".join(content for _, content in group_files)
+        samples.append({
+            "name": name,
+            "source": source,
+            "files": group_files,
+            "traits": trait_vector(body, SAMPLE_TRAITS),
+            "tokens": estimate_tokens(body),
+            "screen": any(SCREEN_ENTRY.search(path) for path, _ in group_files),
+        })
+    return samples
+
+
+def load_sample_library(path: str) -> list:
+    """Index every .txt/.tsx sample file in a folder"""
+    samples = []
+    if not path or not os.path.isdir(path):
+        return samples
+    for name in sorted(os.listdir(path)):
+        fp = os.path.join(path, name)
+        if os.path.isfile(fp) and name.endswith((".txt", ".tsx", ".ts")):
+            try:
+                with open(fp, 'r', encoding='utf-8') as f:
+                    samples.extend(split_samples(f.read(), os.path.splitext(name)[0]))
+            except Exception:
+                pass
+    return samples
+
+
+def request_text(documents: list, user_stories: str = "", mapping: str = "") -> str:
+    """Layer names and texts of the Figma frames plus the stories/mapping, for trait detection"""
+    words = []
+    for document in documents or []:
+        for node, _ in iter_nodes(document):
+            words.append(node.get("name", ""))
+            if node.get("type") == "TEXT":
+                words.append(node.get("characters") or "")
+    return "\n".join([*words, user_stories or "", mapping or ""])
+
+
+def select_samples(samples: list, query_text: str, count: int = 2, budget: int = None) -> tuple:
+    """Pick the `count` screens whose traits are closest to the request, within an optional token budget.
+    Returns (selected samples, rows for display)"""
+    query = trait_vector(query_text, REQUEST_TRAITS)
+    ranked = sorted(samples, key=lambda s: (-cosine(query, s["traits"]), s["tokens"]))
+
+    # `count` screens plus the best supporting (hooks/API) group
+    selected = []
+    used = 0
+    for sample in ranked:
+        similarity = cosine(query, sample["traits"])
+        same_kind = sum(1 for s in selected if s["screen"] == sample["screen"])
+        if sample["screen"] and same_kind >= count:
+            continue
+        if not sample["screen"] and (same_kind >= 1 or similarity <= 0):
+            continue
+        if budget is not None and used + sample["tokens"] > budget:
+            continue
+        selected.append(sample)
+        used += sample["tokens"]
+
+    rows = [{
+        "sample": f"{s['source']}: {s['name']}",
+        "traits": ", ".join(sorted(s["traits"], key=lambda t: -s["traits"][t])),
+        "similarity": round(cosine(query, s["traits"]), 3),
+        "tokens": s["tokens"],
+        "selected": s in selected,
+    } for s in ranked]
+    return selected, rows
+
+
+def render_samples(samples: list) -> str:
+    return render_bundle([f for sample in samples for f in sample["files"]])
@@ -3,19 +3,93 @@
 
 import streamlit as st
 import os
-import re
-import tempfile
 import zipfile
 import time
 from google import genai
-from io import BytesIO
 import sys
 import pandas as pd
 from pathlib import Path
+from io import BytesIO
+
+
+# Both prompts pre-compiled into segments/slots once per process
+from prompt_templates import LAYOUTS, PROMPT_VERSIONS, get_prompt_template, prefix_hash, slot_tier
+from figma_layout import iter_nodes, load_figma_documents, load_figma_component_names, parse_scale_list, parse_spacing_scale, summarize_layout
+from component_resolver import index_components, resolve_instances, build_mapping_rows
+from translation_extractor import (
+    extract_translations,
+    build_translations_section,
+    inject_en_block,
+    parse_journey_and_screen,
+)
+from jsx_skeleton import build_view_skeleton
+from bundle_parser import parse_bundle_files, render_bundle
+from bundle_validator import check_bundle
+from comment_stripper import remove_comments_from_code
+from project_export import DEFAULT_COMPRESSION_LEVEL, build_project_zip, write_to_project
+from component_graph import ImportGraph
+from component_digest import build_component_digest
+from corpus_cache import get_corpus_cache
+from component_watcher import POLL_INTERVAL, get_component_watcher
+from component_search import PICKER_PAGE_SIZE, ComponentSearchIndex
+from component_retrieval import collect_component_files, select_component_files, render_component_files
+from term_masking import DEFAULT_MASK_TERMS, get_masker, parse_mask_terms
+from prompt_dedup import deduplicate_sections
+from image_prep import preprocess_image
+from sample_library import load_sample_library, request_text, render_samples, select_samples, split_samples
+from token_budget import estimate_tokens, DEFAULT_INPUT_BUDGET, IMAGE_TOKENS, GENERATE_TRIM_POLICY, parse_trim_order, plan_budget
+
+
+
+
+# ====================== CACHED LOADERS ======================
+# Streamlit re-runs the script on every interaction and for every session – file reads, parsed tables,
+# component indexes and API clients are shared through Streamlit's caches instead of being rebuilt
+
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def read_text_file(file_path: str, mtime_ns: int) -> str:
+    """File content, cached per path and modification time"""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        return f.read()
 
 
-# Import both prompts from one clean file
-from prompts import GENERATE_PROMPT, ENRICH_PROMPT
+@st.cache_data(show_spinner=False, max_entries=64)
+def decode_upload(data: bytes) -> str:
+    """Uploaded text file without blank lines, cached by content"""
+    return remove_blank_lines(data.decode())
+
+
+@st.cache_data(show_spinner=False, max_entries=16)
+def read_mapping_table(data: bytes, file_name: str) -> pd.DataFrame:
+    """Parsed CSV/XLSX component mapping, cached by content"""
+    if file_name.lower().endswith(".csv"):
+        return pd.read_csv(BytesIO(data))
+    return pd.read_excel(BytesIO(data))
+
+
+@st.cache_resource(show_spinner=False, max_entries=1)
+def get_genai_client(api_key: str):
+    """Client for the current API key – a newly typed key replaces the previous client"""
+    return genai.Client(api_key=api_key)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_component_index(folder_path: str, components: tuple, version: int) -> list:
+    """Component index shared by every session; `version` is the library watcher's, so edits rebuild it"""
+    return index_components(folder_path, list(components))
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_search_index(folder_path: str, components: tuple, version: int) -> ComponentSearchIndex:
+    """Picker search index built over the shared component index, not a second scan of the library"""
+    return ComponentSearchIndex(get_component_index(folder_path, components, version))
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def get_import_graph(folder_path: str, components: tuple, version: int) -> ImportGraph:
+    """Import graph whose parsed folders are reused across reruns until the library changes"""
+    return ImportGraph(folder_path, list(components))
 
 
 # ====================== .ENV PARSING FUNCTION ======================
@@ -25,31 +99,30 @@ def parse_env_file(env_path):
     """Parse .env file and return dictionary of key-value pairs"""
     env_vars = {}
     try:
-        with open(env_path, 'r', encoding='utf-8') as f:
-            for line in f:
-                line = line.strip()
-                # Skip empty lines and comments
-                if not line or line.startswith('#'):
-                    continue
-                # Split on first '=' only
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    
-                    # Remove quotes if present (handles both ' and ")
-                    if value and value[0] in ['"', "'"] and value[-1] in ['"', "'"]:
-                        value = value[1:-1]
-                    
-                    # Remove 'r' prefix if present (from raw strings)
-                    if value.startswith("r'") or value.startswith('r"'):
-                        value = value[2:-1]
-                    
-                    # Normalize Windows paths (convert backslashes to forward slashes)
-                    if '\\' in value:
-                        value = value.replace('\\\\', '/').replace('\\', '/')
-                    
-                    env_vars[key] = value
+        for line in read_text_file(env_path, os.stat(env_path).st_mtime_ns).splitlines():
+            line = line.strip()
+            # Skip empty lines and comments
+            if not line or line.startswith('#'):
+                continue
+            # Split on first '=' only
+            if '=' in line:
+                key, value = line.split('=', 1)
+                key = key.strip()
+                value = value.strip()
+                
+                # Remove quotes if present (handles both ' and ")
+                if value and value[0] in ['"', "'"] and value[-1] in ['"', "'"]:
+                    value = value[1:-1]
+                
+                # Remove 'r' prefix if present (from raw strings)
+                if value.startswith("r'") or value.startswith('r"'):
+                    value = value[2:-1]
+                
+                # Normalize Windows paths (convert backslashes to forward slashes)
+                if '\\' in value:
+                    value = value.replace('\\\\', '/').replace('\\', '/')
+                
+                env_vars[key] = value
         return env_vars
     except Exception as e:
         st.error(f"Error parsing .env file: {e}")
@@ -60,8 +133,7 @@ def load_file_from_path(file_path):
     """Load file content from given path"""
     try:
         if os.path.exists(file_path):
-            with open(file_path, 'r', encoding='utf-8') as f:
-                return f.read()
+            return read_text_file(file_path, os.stat(file_path).st_mtime_ns)
         else:
             st.warning(f"File not found: {file_path}")
             return None
@@ -70,127 +142,6 @@ def load_file_from_path(file_path):
         return None
 
 
-# ====================== MASKING & COMMENT REMOVAL FUNCTIONS ======================
-
-
-def mask_word(text: str, old: str = "GIB", new: str = "ABC") -> str:
-    """Replace 'GIB' (any case) with 'ABC' safely – avoids partial word matches in most cases"""
-    if not old or not text:
-        return text
-
-
-    # Normalize old word
-    old_lower = old.lower()
-
-
-    # Build regex: matches the word in any case
-    pattern = re.compile(re.escape(old), re.IGNORECASE)
-
-
-    def replace(match):
-        matched = match.group(0)
-        start, end = match.start(), match.end()
-
-
-        before_char = text[start-1] if start > 0 else ""
-        after_char = text[end] if end < len(text) else ""
-
-
-        # Only apply strict safety for short words (3–5 letters)
-        if (before_char.isalpha() and before_char.islower()) and \
-           (after_char.isalpha() and after_char.islower()):
-            return matched  # ← block "eligible", "GIBbing"
-
-
-        # For longer sequences (gibretailing, GIBRetailMobile), always replace
-        if matched.isupper():
-            return new.upper()
-        elif matched.islower():
-            return new.lower()
-        elif matched[0].isupper():
-            return new.capitalize()
-        else:
-            return new.capitalize()
-
-
-    return pattern.sub(replace, text)
-
-
-def remove_comments_from_code(content: str) -> str:
-    """Remove //, /* */, and {/** */} comments + clean empty lines"""
-
-
-    original_content = content
-
-
-    # Remove JSX-style {/** */} comments
-    content = re.sub(r'\{/\*.*?\*/\}', '', content, flags=re.DOTALL)
-
-
-    # Remove standard /* */ comments
-    content = re.sub(r'/\*.*?\*/', '', content, flags=re.DOTALL)
-
-
-    lines = content.split('\n')
-    cleaned_lines = []
-
-
-    for line in lines:
-        if '//' in line:
-            in_string = False
-            string_char = None
-            comment_pos = -1
-
-
-            for i, char in enumerate(line):
-                if char in ['"', "'", '`'] and (i == 0 or line[i-1] != '\\'):
-                    if not in_string:
-                        in_string = True
-                        string_char = char
-                    elif char == string_char:
-                        in_string = False
-                        string_char = None
-
-
-                if not in_string and i < len(line) - 1 and line[i:i+2] == '//':
-                    comment_pos = i
-                    break
-
-
-            if comment_pos != -1:
-                line = line[:comment_pos].rstrip()
-
-
-        cleaned_lines.append(line)
-
-
-    content = '\n'.join(cleaned_lines)
-
-
-    # Remove excessive blank lines
-    lines = content.split('\n')
-    cleaned_lines = []
-    prev_empty = False
-
-
-    for line in lines:
-        is_empty = line.strip() == ''
-
-
-        if not is_empty:
-            cleaned_lines.append(line)
-            prev_empty = False
-        elif not prev_empty:
-            cleaned_lines.append(line)
-            prev_empty = True
-
-
-    content = '\n'.join(cleaned_lines)
-
-
-    return content
-
-
 # ====================== CONFIG ======================
 st.set_page_config(page_title="Figma to React Native Converter", layout="wide", page_icon="📱")
 
@@ -246,14 +197,28 @@ session_keys = {
     "components": [],
     "selected_components": [],
     "folder_path": "",
+    "watcher_version": 0,
     "mapping_text": "",
     "component_df": None,
+    "auto_mapping": False,
     "generated": "",
     "enriched": "",
     "figma_imgs_tab1": [],
     "figma_imgs_tab2": [],
     "conventions_content": "",
     "theme_content": "",
+    "spacing_scale": [],
+    "trim_priority": "",
+    "mask_terms": dict(DEFAULT_MASK_TERMS),
+    "prompt_layout": "original",
+    "prompt_version": "current",
+    "sample_library_path": "",
+    "target_project_path": "",
+    "watch_poll_interval": POLL_INTERVAL,
+    "optimize_images": True,
+    "auto_fix_conventions": True,
+    "output_versions": {},
+    "prefix_hashes": {},
     "additional_context": "FeatureName:\nScreenName(ViewName):\nAdditionalContext:",
 }
 
@@ -297,6 +262,14 @@ with st.sidebar:
                     if content:
                         st.session_state["sample_code_content"] = content
                 
+                # Load Sample Library folder (one sample bundle per file)
+                if "SAMPLE_LIBRARY_PATH" in env_vars:
+                    st.session_state.sample_library_path = env_vars["SAMPLE_LIBRARY_PATH"]
+
+                # Load target project checkout for direct export
+                if "TARGET_PROJECT_PATH" in env_vars:
+                    st.session_state.target_project_path = env_vars["TARGET_PROJECT_PATH"]
+                
                 # Load Package Structure
                 if "PACKAGE_STRUCTURE_PATH" in env_vars:
                     content = load_file_from_path(env_vars["PACKAGE_STRUCTURE_PATH"])
@@ -309,6 +282,37 @@ with st.sidebar:
                     if content:
                         st.session_state.theme_content = content
                 
+                # Load Spacing Scale (comma separated, e.g. 0,4,8,12,16,24,32)
+                if "SPACING_SCALE" in env_vars:
+                    try:
+                        st.session_state.spacing_scale = parse_scale_list(env_vars["SPACING_SCALE"])
+                    except ValueError:
+                        st.session_state.spacing_scale = []
+                        st.warning(f"⚠️ SPACING_SCALE '{env_vars['SPACING_SCALE']}' is not a list of numbers – using the theme file or the design's own scale")
+                
+                # Load prompt trimming order (comma separated section names, trimmed first → last)
+                if "TRIM_PRIORITY" in env_vars:
+                    st.session_state.trim_priority = env_vars["TRIM_PRIORITY"]
+                
+                # Load masking dictionary (comma separated term:replacement pairs, e.g. GIB:ABC)
+                if "MASK_TERMS" in env_vars:
+                    st.session_state.mask_terms = parse_mask_terms(env_vars["MASK_TERMS"]) or dict(DEFAULT_MASK_TERMS)
+                
+                # Load prompt version (current, v3, v2, v1)
+                if env_vars.get("PROMPT_VERSION") in PROMPT_VERSIONS:
+                    st.session_state.prompt_version = env_vars["PROMPT_VERSION"]
+                
+                # Load prompt layout (original | cache-friendly)
+                if env_vars.get("PROMPT_LAYOUT") in LAYOUTS:
+                    st.session_state.prompt_layout = env_vars["PROMPT_LAYOUT"]
+                
+                # Load component folder scan interval in seconds (only used when watchdog is not installed)
+                if "WATCH_POLL_INTERVAL" in env_vars:
+                    try:
+                        st.session_state.watch_poll_interval = max(float(env_vars["WATCH_POLL_INTERVAL"]), 1.0)
+                    except ValueError:
+                        st.warning(f"⚠️ WATCH_POLL_INTERVAL '{env_vars['WATCH_POLL_INTERVAL']}' is not a number – using {POLL_INTERVAL:g}s")
+
                 # Load Components Folder Path
                 if "COMPONENTS_FOLDER_PATH" in env_vars:
                     st.session_state.folder_path = env_vars["COMPONENTS_FOLDER_PATH"]
@@ -335,6 +339,35 @@ with st.sidebar:
     )
     st.session_state.api_key = api_key
 
+    st.session_state.optimize_images = st.checkbox(
+        "🖼️ Optimize images",
+        value=st.session_state.optimize_images,
+        help="Trim empty margins, downscale and re-encode screenshots before sending (cached per image)"
+    )
+
+    st.session_state.auto_fix_conventions = st.checkbox(
+        "🩺 Validate & auto-fix conventions",
+        value=st.session_state.auto_fix_conventions,
+        help="Fix import order, path aliases, hook/schema locations and component ID casing in generated code and before export"
+    )
+
+    # Prompt files are parsed on first use, so versions can be switched without a restart
+    prompt_versions = list(PROMPT_VERSIONS)
+    st.session_state.prompt_version = st.selectbox(
+        "🗂️ Prompt version",
+        prompt_versions,
+        index=prompt_versions.index(st.session_state.prompt_version),
+        help="current = prompts.py; v3/v2/v1 = prompts_3/2/1.py (older versions ignore newer inputs)"
+    )
+
+    # Cache-friendly: static instructions → per-project context → per-screen data, so calls share a prefix
+    st.session_state.prompt_layout = st.selectbox(
+        "🧱 Prompt layout",
+        LAYOUTS,
+        index=LAYOUTS.index(st.session_state.prompt_layout),
+        help="Cache-friendly orders static instructions first, then project context (conventions, package structure, API endpoints, theme), then screen data"
+    )
+
 
 # ====================== CLEAN HELPERS ======================
 
@@ -361,27 +394,97 @@ def split_large_file(file_content, lines_per_chunk=8500):
     return ["".join(lines[i:i + lines_per_chunk]) for i in range(0, len(lines), lines_per_chunk)]
 
 
-def merge_components(base_path, folders):
-    result = ""
-    for folder in folders:
-        path = os.path.join(base_path, folder)
-        if not os.path.isdir(path):
-            continue
-        result += f"\n// COMPONENT: {folder}\n"
-        for root, _, files in os.walk(path):
-            if "assets" in os.path.basename(root):
-                continue
-            for file in files:
-                if file.endswith(('.tsx', '.ts', '.js', '.jsx')):
-                    fp = os.path.join(root, file)
-                    rel = os.path.relpath(fp, base_path).replace("\\", "/")
-                    try:
-                        with open(fp, 'r', encoding='utf-8') as f:
-                            content = "\n".join(l for l in f.read().splitlines() if l.strip())
-                            result += f"// {rel}\n{content}\n\n"
-                    except Exception:
-                        pass
-    return result
+def parse_figma_json(json_text):
+    """Parse Figma API data into (documents, componentId → name); empty on missing/invalid input"""
+    if not json_text:
+        return [], {}
+    try:
+        return load_figma_documents(json_text), load_figma_component_names(json_text)
+    except ValueError as e:
+        st.warning(f"Could not parse Figma API data: {e}")
+        return [], {}
+
+
+def build_figma_layout_summary(documents, theme_text=""):
+    """Summarize Figma auto-layout frames with spacing snapped to the project scale"""
+    if not documents:
+        return "None"
+
+    # Scale priority: .env SPACING_SCALE → theme file → derived from the design
+    scale = st.session_state.spacing_scale or parse_spacing_scale(theme_text)
+    return summarize_layout(documents, scale)
+
+
+def apply_convention_fixes(code_text):
+    """Validate a ###FilePath bundle, auto-fix the mechanical violations locally and show the report"""
+    records, issues = parse_bundle_files(code_text)
+    if not records:
+        return code_text
+
+    files, violations = check_bundle([(record.path, record.content) for record in records])
+    # Text outside file blocks and duplicate, unsafe and empty blocks are not in the fixed bundle – list them
+    violations += [
+        {"path": i["path"], "rule": i["issue"], "line": i["line"], "message": i["message"], "fixed": False}
+        for i in issues
+    ]
+    fixed = [v for v in violations if v["fixed"]]
+    remaining = [v for v in violations if not v["fixed"]]
+    with st.expander(f"🩺 Convention check: {len(fixed)} auto-fixed, {len(remaining)} to review", expanded=bool(remaining)):
+        if violations:
+            st.dataframe(pd.DataFrame(remaining + fixed), width='stretch')
+        else:
+            st.write("No convention violations found.")
+    return render_bundle(files)
+
+
+def build_image_parts(images):
+    """Gemini parts for uploaded images – preprocessed (and cached by content hash) when enabled.
+    Returns (parts, estimated image tokens)"""
+    parts = []
+    tokens = 0
+    original_bytes = sent_bytes = 0
+    for img in images:
+        data = img.getvalue()
+        if st.session_state.optimize_images:
+            processed = preprocess_image(data, img.type)
+        else:
+            processed = {"data": data, "mime_type": img.type, "original_bytes": len(data), "tokens": IMAGE_TOKENS}
+        parts.append(genai.types.Part.from_bytes(data=processed["data"], mime_type=processed["mime_type"]))
+        tokens += processed["tokens"]
+        original_bytes += processed["original_bytes"]
+        sent_bytes += len(processed["data"])
+    if images:
+        st.caption(f"🖼️ {len(images)} image(s): {original_bytes / 1024:,.0f} KB → {sent_bytes / 1024:,.0f} KB, ~{tokens:,} image tokens")
+    return parts, tokens
+
+
+def report_prompt_prefix(tab_key, prefix):
+    """Show the stable prompt prefix hash and whether it matches the previous call from the same tab"""
+    digest = prefix_hash(prefix)
+    previous = st.session_state.prefix_hashes.get(tab_key)
+    st.session_state.prefix_hashes[tab_key] = digest
+    if previous is None:
+        status = "first call"
+    else:
+        status = "same as previous call" if previous == digest else "changed since previous call"
+    st.caption(f"🔗 Stable prompt prefix `{digest}` · ~{estimate_tokens(prefix):,} tokens · {status}")
+    return digest
+
+
+def retrieve_component_sources(folders, mapping, user_stories_txt, figma_documents, figma_component_names, budget):
+    """Full sources of the given components, ranked against the mapping, Figma instances and user stories"""
+    if not folders:
+        return "", []
+    component_files = collect_component_files(st.session_state.folder_path, folders)
+    instance_names = [
+        node.get("name", "")
+        for document in figma_documents
+        for node, _ in iter_nodes(document)
+        if node.get("type") == "INSTANCE"
+    ]
+    query = "\n".join([mapping, user_stories_txt, *instance_names, *figma_component_names.values()])
+    component_files, rows = select_component_files(component_files, query, budget)
+    return render_component_files(component_files), rows
 
 
 # ====================== TABS ======================
@@ -419,6 +522,13 @@ with tab1:
             for idx, img in enumerate(figma_imgs):
                 cols[idx % 3].image(img, width=180, caption=img.name.split('.')[0])
 
+        figma_json_tab1 = st.file_uploader(
+            "📊 Optional: Figma API Data",
+            type=["json", "txt"],
+            key="figma_json_tab1",
+            help="Used to build a layout summary with spacing snapped to the project scale"
+        )
+
 
     with col2:
         
@@ -446,10 +556,7 @@ with tab1:
 
         if component_mapping_file is not None:
             try:
-                if component_mapping_file.name.lower().endswith(".csv"):
-                    df = pd.read_csv(component_mapping_file)
-                else:
-                    df = pd.read_excel(component_mapping_file)
+                df = read_mapping_table(component_mapping_file.getvalue(), component_mapping_file.name)
                 # Ensure at least 3 columns; rename first three for clarity
                 if df.shape[1] >= 3:
                     df = df.iloc[:, :3]
@@ -463,8 +570,9 @@ with tab1:
 
 
             st.session_state.component_df = df
-        else:
-            # If file is removed/not uploaded, reset to None
+            st.session_state.auto_mapping = False
+        elif not st.session_state.auto_mapping:
+            # If file is removed/not uploaded (and no auto mapping), reset to None
             st.session_state.component_df = None
 
         # ============ NEW: EXPANDER FOR GROUPED FILES ============
@@ -498,15 +606,65 @@ with tab1:
     folder = st.text_input("📁 Existing Components Folder:", value=st.session_state.folder_path)
     if st.button("Load Components") and folder and os.path.exists(folder):
         st.session_state.folder_path = folder
-        st.session_state.components = sorted(
-            [d for d in os.listdir(folder) if os.path.isdir(os.path.join(folder, d))]
-        )
+        watcher = get_component_watcher(folder, st.session_state.watch_poll_interval)
+        st.session_state.components = watcher.folders()
+        st.session_state.watcher_version = watcher.version
         st.success(f"Loaded {len(st.session_state.components)} components")
 
 
+    # A background watcher keeps the folder list and file cache current – folders added or removed show up without a rescan
+    if st.session_state.components and st.session_state.folder_path:
+        watcher = get_component_watcher(st.session_state.folder_path, st.session_state.watch_poll_interval)
+        if watcher.version != st.session_state.watcher_version:
+            st.session_state.components = watcher.folders()
+            st.session_state.watcher_version = watcher.version
+        st.caption(f"👀 Watching {len(st.session_state.components)} components for changes ({watcher.mode})")
+
+
+    # Auto-map Figma INSTANCE nodes to existing components (needs Figma API data)
+    if st.session_state.components and figma_json_tab1:
+        if st.button("🔎 Auto-map Figma Components"):
+            figma_documents, figma_component_names = parse_figma_json(figma_json_tab1.getvalue().decode())
+            resolved = resolve_instances(
+                figma_documents,
+                figma_component_names,
+                get_component_index(
+                    st.session_state.folder_path, tuple(st.session_state.components), st.session_state.watcher_version
+                )
+            )
+
+            if resolved:
+                st.session_state.component_df = pd.DataFrame(
+                    build_mapping_rows(resolved),
+                    columns=["Component-Folder Name", "Component Name", "Mapping"]
+                )
+                st.session_state.auto_mapping = True
+
+                # Select only the resolved components; dropping checkbox state
+                # lets each checkbox re-initialize from the new selection
+                needed = {r["folder"] for r in resolved}
+                st.session_state.selected_components = sorted(needed)
+                for c in st.session_state.components:
+                    st.session_state.pop(f"cb1_{c}", None)
+                st.success(f"Mapped {len(resolved)} Figma instance(s) to {len(needed)} component(s)")
+            else:
+                st.warning("No Figma instances matched the loaded components")
+
+
     if st.session_state.components:
-        search = st.text_input("Search components:", key="search1")
-        filtered = [c for c in st.session_state.components if search.lower() in c.lower()]
+        search = st.text_input("Search components:", key="search1", help="Fuzzy match on folder and exported component names")
+        search_index = get_search_index(
+            st.session_state.folder_path, tuple(st.session_state.components), st.session_state.watcher_version
+        )
+        matches = search_index.search(search)
+        filtered = [folder for folder, _, _ in matches]
+
+
+        # Ranked results are paged so each rerun renders a bounded number of checkboxes
+        pages = max(1, -(-len(filtered) // PICKER_PAGE_SIZE))
+        if pages > 1:
+            page = st.number_input(f"Page (of {pages}, {len(filtered)} matches)", min_value=1, max_value=pages, value=1, key="search1_page")
+            filtered = filtered[(page - 1) * PICKER_PAGE_SIZE:page * PICKER_PAGE_SIZE]
 
 
         cols = st.columns(5)
@@ -596,6 +754,43 @@ with tab1:
                 st.session_state.mapping_text = mapping
 
 
+    sample_screen_count = st.number_input(
+        "🎯 Sample screens to include",
+        min_value=0,
+        max_value=5,
+        value=2,
+        help="Sample screens most similar to the Figma design and user stories (forms, lists, review, calculator...). 0 sends the whole sample file"
+    )
+    full_component_sources = st.checkbox(
+        "📚 Send full component sources",
+        value=False,
+        help="By default only a props/types digest of the selected components is sent"
+    )
+    import_depth = st.number_input(
+        "🔗 Include imported components (depth)",
+        min_value=0,
+        max_value=5,
+        value=2,
+        help="Components imported by the selected ones are added automatically, up to this many import hops. 0 sends only the selection"
+    )
+    component_budget = st.number_input(
+        "📚 Component source budget (tokens)",
+        min_value=1_000,
+        value=40_000,
+        step=5_000,
+        help="Component files are ranked against the mapping, Figma instances and user stories; only the top files within this budget are sent"
+    )
+
+
+    token_budget = st.number_input(
+        "🧮 Input token budget",
+        min_value=10_000,
+        value=DEFAULT_INPUT_BUDGET,
+        step=50_000,
+        help="Lower-priority sections (sample code, existing components, ...) are trimmed when the prompt exceeds this"
+    )
+
+
     if st.button("Generate Code", type="primary"):
         if not st.session_state.api_key:
             st.error("Please enter your Gemini API key in the sidebar")
@@ -608,27 +803,24 @@ with tab1:
                 st.error("Please upload the Conventions & Standards file or load from .env")
             else:
                 with st.spinner("Generating code using Gemini..."):
-                    client = genai.Client(api_key=st.session_state.api_key)
+                    client = get_genai_client(st.session_state.api_key)
+                    generate_template = get_prompt_template(
+                        "generate", st.session_state.prompt_version, st.session_state.prompt_layout
+                    )
 
 
                     # Read conventions - prioritize uploaded file, fallback to .env
                     if conventions_file:
-                        conventions_content = remove_blank_lines(conventions_file.read().decode())
+                        conventions_content = decode_upload(conventions_file.getvalue())
                     else:
                         conventions_content = remove_blank_lines(st.session_state.conventions_content)
 
 
-                    merged = merge_components(
-                        st.session_state.folder_path,
-                        st.session_state.selected_components
-                    ) if st.session_state.selected_components else ""
-
-
-                    user_stories_txt = remove_blank_lines(user_stories.read().decode()) if user_stories else "None"
+                    user_stories_txt = decode_upload(user_stories.getvalue()) if user_stories else "None"
                     
                     # Sample code - prioritize upload, fallback to .env
                     if sample_code:
-                        sample_code_txt = remove_blank_lines(sample_code.read().decode())
+                        sample_code_txt = decode_upload(sample_code.getvalue())
                     elif "sample_code_content" in st.session_state and st.session_state["sample_code_content"]:
                         sample_code_txt = remove_blank_lines(st.session_state["sample_code_content"])
                     else:
@@ -636,7 +828,7 @@ with tab1:
                     
                     # Package structure - prioritize upload, fallback to .env
                     if package_json:
-                        package_txt = remove_blank_lines(package_json.read().decode())
+                        package_txt = decode_upload(package_json.getvalue())
                     elif "package_structure_content" in st.session_state and st.session_state["package_structure_content"]:
                         package_txt = remove_blank_lines(st.session_state["package_structure_content"])
                     else:
@@ -644,7 +836,7 @@ with tab1:
                     
                     # API endpoints - prioritize upload, fallback to .env
                     if api_endpoints_file:
-                        api_endpoints_txt = remove_blank_lines(api_endpoints_file.read().decode())
+                        api_endpoints_txt = decode_upload(api_endpoints_file.getvalue())
                     elif "api_endpoints_content" in st.session_state and st.session_state["api_endpoints_content"]:
                         api_endpoints_txt = remove_blank_lines(st.session_state["api_endpoints_content"])
                     else:
@@ -686,18 +878,146 @@ with tab1:
                         mapping = st.session_state.mapping_text
 
 
+                    # Figma layout summary with snapped spacing (optional)
+                    figma_documents, figma_component_names = parse_figma_json(
+                        figma_json_tab1.getvalue().decode() if figma_json_tab1 else ""
+                    )
+                    figma_layout_txt = build_figma_layout_summary(figma_documents, st.session_state.theme_content)
+
+
+                    # Most similar sample screens instead of the whole sample file
+                    if sample_screen_count:
+                        samples = load_sample_library(st.session_state.sample_library_path)
+                        if sample_code_txt != "None":
+                            samples = split_samples(sample_code_txt, "sample code") + samples
+                        if len(samples) > 1:
+                            chosen_samples, sample_rows = select_samples(
+                                samples,
+                                request_text(figma_documents, user_stories_txt, mapping),
+                                sample_screen_count
+                            )
+                            sample_code_txt = render_samples(chosen_samples)
+                            with st.expander(f"🎯 Sample screens: {len(chosen_samples)} of {len(samples)} selected"):
+                                st.dataframe(pd.DataFrame(sample_rows), width='stretch', hide_index=True)
+
+
+                    # Pre-generated English translations from Figma TEXT nodes (optional)
+                    journey, screen_name = parse_journey_and_screen(mapping)
+                    translations = extract_translations(figma_documents, figma_component_names, journey, screen_name)
+
+
+                    # JSX skeleton from the Figma frame tree (optional)
+                    component_index = get_component_index(
+                        st.session_state.folder_path, tuple(st.session_state.components), st.session_state.watcher_version
+                    ) if st.session_state.components else []
+                    view_skeleton_txt = build_view_skeleton(
+                        figma_documents,
+                        figma_component_names,
+                        component_index,
+                        translations,
+                        st.session_state.spacing_scale or parse_spacing_scale(st.session_state.theme_content)
+                    )
+
+
+                    # Selected components: props/types digest, or full sources ranked by relevance and cut to the budget
+                    corpus = get_corpus_cache(st.session_state.folder_path) if st.session_state.folder_path else None
+                    corpus_reads = (corpus.hits, corpus.misses, corpus.io_seconds) if corpus else (0, 0, 0.0)
+
+                    # Sibling components the selection imports (transitively), so nothing needs over-selecting
+                    component_folders = st.session_state.selected_components or []
+                    if component_folders and import_depth:
+                        component_folders, closure_rows = get_import_graph(
+                            st.session_state.folder_path, tuple(st.session_state.components), st.session_state.watcher_version
+                        ).closure(component_folders, import_depth, component_budget if full_component_sources else None)
+                        if closure_rows:
+                            added = sum(row["included"] for row in closure_rows)
+                            with st.expander(f"🔗 Imported components: {added} added to the selection"):
+                                st.dataframe(pd.DataFrame(closure_rows), width='stretch', hide_index=True)
+
+                    if full_component_sources:
+                        merged, retrieval_rows = retrieve_component_sources(
+                            component_folders, mapping, user_stories_txt, figma_documents, figma_component_names, component_budget
+                        )
+                    else:
+                        merged = build_component_digest(
+                            st.session_state.folder_path, component_folders
+                        ) if component_folders else ""
+                        retrieval_rows = []
+                    if corpus and (corpus.hits, corpus.misses) != corpus_reads[:2]:
+                        st.caption(
+                            f"📦 Component corpus: {corpus.hits - corpus_reads[0]} file(s) from cache, "
+                            f"{corpus.misses - corpus_reads[1]} re-read, I/O {corpus.io_seconds - corpus_reads[2]:.2f}s"
+                        )
+                    if retrieval_rows:
+                        included = sum(row["included"] for row in retrieval_rows)
+                        with st.expander(f"📚 Component sources: {included} of {len(retrieval_rows)} files included"):
+                            st.dataframe(pd.DataFrame(retrieval_rows), width='stretch', hide_index=True)
+
+
+                    # Masked like the prompt, so injected keys match the model's t('...') calls
+                    masker = get_masker(st.session_state.mask_terms)
+                    translations = [(masker.mask(key), masker.mask(text)) for key, text in translations]
+                    translations_txt = build_translations_section(translations, journey, screen_name)
+
+
                     # Substitute all placeholders including api_endpoints
-                    prompt = GENERATE_PROMPT.replace("{conventions_and_standards}", conventions_content) \
-                        .replace("{component_mapping}", mapping) \
-                        .replace("{existing_components}", merged) \
-                        .replace("{user_stories_file_content}", user_stories_txt) \
-                        .replace("{sample_code}", sample_code_txt) \
-                        .replace("{package_structure}", package_txt) \
-                        .replace("{api_endpoints}", api_endpoints_txt)
+                    sections = {
+                        "conventions_and_standards": conventions_content,
+                        "component_mapping": mapping,
+                        "existing_components": merged,
+                        "user_stories_file_content": user_stories_txt,
+                        "sample_code": sample_code_txt,
+                        "package_structure": package_txt,
+                        "api_endpoints": api_endpoints_txt,
+                        "figma_layout_summary": figma_layout_txt,
+                        "pregenerated_translations": translations_txt,
+                        "view_skeleton": view_skeleton_txt,
+                    }
+
+
+                    # Paragraphs/code blocks repeated across the inputs and the prompt itself are sent once
+                    sections = generate_template.select(sections)
+                    sections, dedup_rows = deduplicate_sections(sections, generate_template.static_text)
+                    if dedup_rows:
+                        saved_tokens = sum(row["tokens saved"] for row in dedup_rows)
+                        with st.expander(f"♻️ Duplicate content removed: ~{saved_tokens:,} tokens saved"):
+                            st.dataframe(pd.DataFrame(dedup_rows), width='stretch', hide_index=True)
+
+
+                    # Images are sized and encoded first so their real token cost counts against the budget
+                    image_parts, image_tokens = build_image_parts(figma_imgs)
+
+
+                    # Token accounting per section; trim by priority when over budget
+                    trim_policy = parse_trim_order(st.session_state.trim_priority, GENERATE_TRIM_POLICY)
+                    if st.session_state.prompt_layout == "cache-friendly":
+                        # Trimming the per-project context would change the shared prefix from screen to screen
+                        trim_policy = {name: rule for name, rule in trim_policy.items() if slot_tier(name) > 1}
+                    sections, budget_rows, total_tokens = plan_budget(
+                        sections,
+                        generate_template.static_text,
+                        token_budget,
+                        trim_policy,
+                        image_count=len(figma_imgs),
+                        image_tokens=image_tokens
+                    )
+                    trimmed_tokens = sum(row["trimmed"] for row in budget_rows)
+                    with st.expander(f"🧮 Prompt tokens: ~{total_tokens:,} of {token_budget:,}"
+                                     + (f" ({trimmed_tokens:,} trimmed)" if trimmed_tokens else "")):
+                        st.dataframe(pd.DataFrame(budget_rows), width='stretch', hide_index=True)
+                    if total_tokens > token_budget:
+                        st.warning("Prompt is still over budget after trimming – consider selecting fewer components")
+
+                    prompt_prefix, prompt_rest = generate_template.render_split(**sections)
 
 
-                    # APPLY GIB MASKING BEFORE HITTING LLM
-                    prompt = mask_word(prompt)
+                    # APPLY MASKING BEFORE HITTING LLM (one pass for the whole dictionary)
+                    collisions = masker.collisions(prompt_prefix + prompt_rest)
+                    if collisions:
+                        st.warning(f"Mask replacements already present in the inputs ({', '.join(collisions)}) – they will be unmasked in the output too")
+                    prompt_prefix, prompt_rest = masker.mask(prompt_prefix), masker.mask(prompt_rest)
+                    prompt = prompt_prefix + prompt_rest
+                    report_prompt_prefix("generate", prompt_prefix)
 
 
                     try:
@@ -711,20 +1031,30 @@ with tab1:
 
 
                     # Build content: images first, then prompt
-                    contents = []
-                    for img in figma_imgs:
-                        contents.append(genai.types.Part.from_bytes(data=img.read(), mime_type=img.type))
-                        img.seek(0)  # reset for future use
-                    contents.append(prompt)
+                    if st.session_state.prompt_layout == "cache-friendly":
+                        # Per-screen images go after the stable prefix so they don't break it
+                        contents = [prompt_prefix] + image_parts + [prompt_rest]
+                    else:
+                        contents = image_parts + [prompt]
 
 
                     resp = client.models.generate_content(
                         model="gemini-2.5-flash",
                         contents=contents,
                     )
-                    st.session_state.generated = resp.text
+                    # Insert the pre-generated `en` entries at the model's marker (or the top of its `en` object)
+                    generated, inserted = inject_en_block(resp.text, translations)
+                    if not inserted:
+                        st.warning(f"⚠️ No `export const en = {{` in the generated translations.ts – add the {len(translations)} pre-generated English entries by hand")
+                    # Restore the real names so exported code matches the codebase
+                    generated = masker.unmask(generated)
+                    if st.session_state.auto_fix_conventions:
+                        generated = apply_convention_fixes(generated)
+                    st.session_state.generated = generated
+                    st.session_state.output_versions["generated"] = generate_template.version
                     st.success("✅ Code generated successfully!")
-                    st.download_button("⬇️ Download Generated Code", resp.text, "generated_code.txt")
+                    st.caption(f"🗂️ Prompt: `{generate_template.version}`")
+                    st.download_button("⬇️ Download Generated Code", generated, "generated_code.txt")
 
 
 # ====================== TAB 2: Enhance Styling ======================
@@ -785,7 +1115,7 @@ with tab2:
     if st.button("✨ Start Enhancement", type="primary"):
         # Determine which code to use
         if code_in:
-            current_code = remove_blank_lines(code_in.read().decode())
+            current_code = decode_upload(code_in.getvalue())
         elif st.session_state.generated:
             current_code = remove_blank_lines(st.session_state.generated)
         else:
@@ -793,7 +1123,7 @@ with tab2:
         
         # Determine which theme to use
         if theme:
-            theme_txt = remove_blank_lines(theme.read().decode())
+            theme_txt = decode_upload(theme.getvalue())
         elif st.session_state.theme_content:
             theme_txt = remove_blank_lines(st.session_state.theme_content)
         else:
@@ -804,10 +1134,15 @@ with tab2:
             st.error("❌ All fields are required!")
         else:
             with st.spinner("⏳ Enhancing styling ..."):
-                client = genai.Client(api_key=st.session_state.api_key)
+                client = get_genai_client(st.session_state.api_key)
 
 
-                json_content = figma_json_file.read().decode()
+                json_content = figma_json_file.getvalue().decode()
+
+
+                # Summarize the full screen once; chunks alone are not valid JSON
+                figma_documents, _ = parse_figma_json(json_content)
+                figma_layout_txt = build_figma_layout_summary(figma_documents, theme_txt)
 
 
                 # Hardcoded lines_per_chunk = 21500
@@ -815,34 +1150,42 @@ with tab2:
                 st.info(f"📊 Processing Figma API Json file")
 
 
-                # Prepare image parts once
-                image_parts = [
-                    genai.types.Part.from_bytes(data=img.read(), mime_type=img.type)
-                    for img in figma_imgs_enrich
-                ]
-                for img in figma_imgs_enrich:
-                    img.seek(0)
+                # Prepare image parts once – every chunk reuses the same processed bytes
+                image_parts, _ = build_image_parts(figma_imgs_enrich)
+
+
+                # Mask the template and the fixed inputs once; model output stays masked between chunks
+                masker = get_masker(st.session_state.mask_terms)
+                enrich_template = get_prompt_template(
+                    "enrich", st.session_state.prompt_version, st.session_state.prompt_layout
+                )
+                enrich_template = enrich_template.transform(masker.mask)
+                chunks = [masker.mask(chunk) for chunk in chunks]
+                theme_txt = masker.mask(theme_txt)
+                figma_layout_txt = masker.mask(figma_layout_txt)
+                current_code = masker.mask(current_code)
 
 
                 progress_bar = st.progress(0)
                 status = st.empty()
 
 
+                chunk_prefix_hashes = []
                 for i, chunk in enumerate(chunks):
                     status.text(f"🔄 Processing code {i+1}/{len(chunks)}...")
 
 
-                    prompt = ENRICH_PROMPT \
-                        .replace("{iteration_number}", str(i+1)) \
-                        .replace("{part_number}", str(i+1)) \
-                        .replace("{total_parts}", str(len(chunks))) \
-                        .replace("{current_code}", current_code) \
-                        .replace("{figma_json_chunk}", chunk) \
-                        .replace("{theme_colors_content}", theme_txt)
-
-
-                    # APPLY GIB MASKING BEFORE HITTING LLM
-                    prompt = mask_word(prompt)
+                    prompt_prefix, prompt_rest = enrich_template.render_split(**enrich_template.select({
+                        "iteration_number": i + 1,
+                        "part_number": i + 1,
+                        "total_parts": len(chunks),
+                        "current_code": current_code,
+                        "figma_json_chunk": chunk,
+                        "theme_colors_content": theme_txt,
+                        "figma_layout_summary": figma_layout_txt,
+                    }))
+                    prompt = prompt_prefix + prompt_rest
+                    chunk_prefix_hashes.append(prefix_hash(prompt_prefix))
 
 
                     try:
@@ -858,7 +1201,11 @@ with tab2:
                     try:
                         response = client.models.generate_content(
                             model="gemini-2.5-flash",
-                            contents=image_parts + [prompt],
+                            contents=(
+                                [prompt_prefix] + image_parts + [prompt_rest]
+                                if st.session_state.prompt_layout == "cache-friendly"
+                                else image_parts + [prompt]
+                            ),
                         )
                         current_code = response.text
                         progress_bar.progress((i + 1) / len(chunks))
@@ -868,9 +1215,16 @@ with tab2:
                         break
 
 
-                st.session_state.enriched = current_code
+                st.session_state.enriched = masker.unmask(current_code)
+                st.session_state.output_versions["enriched"] = enrich_template.version
+                if chunk_prefix_hashes:
+                    st.caption(
+                        f"🔗 Stable prompt prefix: {len(set(chunk_prefix_hashes))} distinct across "
+                        f"{len(chunk_prefix_hashes)} calls (`{chunk_prefix_hashes[0]}`)"
+                    )
                 status.empty()
                 st.success("✨ Styling enhancement complete!")
+                st.caption(f"🗂️ Prompt: `{enrich_template.version}`")
                 st.balloons()
 
 
@@ -909,10 +1263,38 @@ with tab3:
     )
 
 
-    if st.button("📦 Create ZIP Archive"):
+    zip_col1, zip_col2 = st.columns(2)
+    compression_level = zip_col1.slider(
+        "🗜️ Compression level",
+        min_value=0,
+        max_value=9,
+        value=DEFAULT_COMPRESSION_LEVEL,
+        help="0 stores files uncompressed (fastest), 9 gives the smallest archive"
+    )
+    zip64 = zip_col2.checkbox(
+        "ZIP64",
+        value=True,
+        help="Allow archives over 4 GB or with more than 65,535 files"
+    )
+
+
+    target_project = st.text_input(
+        "📂 Target project folder (optional)",
+        value=st.session_state.target_project_path,
+        help="Local React Native checkout to write the files into – only files whose content changed are touched"
+    )
+    st.session_state.target_project_path = target_project
+
+
+    button_col1, button_col2 = st.columns(2)
+    create_zip = button_col1.button("📦 Create ZIP Archive")
+    write_project = button_col2.button("✍️ Write to Project", disabled=not target_project)
+
+
+    if create_zip or write_project:
         # Determine which code to use
         if zip_input:
-            raw_content = zip_input.read().decode()
+            raw_content = zip_input.getvalue().decode()
         elif st.session_state.enriched:
             raw_content = st.session_state.enriched
         else:
@@ -931,47 +1313,49 @@ with tab3:
             content = cleaned_content  # Use cleaned/original content for ZIP
 
 
-            with tempfile.TemporaryDirectory() as tmp_dir:
-                current_path = None
-                lines = []
-
-
-                def save_file():
-                    if current_path and lines:
-                        full_path = os.path.join(tmp_dir, current_path)
-                        os.makedirs(os.path.dirname(full_path), exist_ok=True)
-                        with open(full_path, "w", encoding="utf-8") as f:
-                            f.write("\n".join(lines))
+            if st.session_state.auto_fix_conventions:
+                content = apply_convention_fixes(content)
 
 
-                for line in content.splitlines():
-                    match = re.search(r"###FilePath:\s*(.+)", line)
-                    if match:
-                        save_file()
-                        current_path = match.group(1).strip()
-                        lines = []
-                    elif not line.strip().startswith("```"):
-                        lines.append(line.rstrip())
-                save_file()
-
-
-                buffer = BytesIO()
-                with zipfile.ZipFile(buffer, "w", zipfile.ZIP_DEFLATED) as z:
-                    for root, _, files in os.walk(tmp_dir):
-                        for file in files:
-                            file_path = os.path.join(root, file)
-                            arc_name = os.path.relpath(file_path, tmp_dir)
-                            z.write(file_path, arc_name)
-                buffer.seek(0)
-
-
-                st.download_button(
-                    "📥 Download Project ZIP",
-                    buffer,
-                    "react_native_project.zip",
-                    "application/zip"
-                )
-                st.success("✅ Project archive created successfully!")
+            # Later blocks for the same path replace earlier ones; unsafe paths are never written
+            records, issues = parse_bundle_files(content)
+            files = [(record.path, record.content) for record in records]
+            for issue in issues:
+                st.warning(f"⚠️ {issue['path']} (line {issue['line']}): {issue['message']}")
+            if write_project:
+                if not os.path.isdir(target_project):
+                    st.error(f"❌ Target project folder not found: {target_project}")
+                else:
+                    write_rows = write_to_project(files, target_project)
+                    counts = pd.Series([row["status"] for row in write_rows]).value_counts()
+                    st.success(
+                        f"✅ {counts.get('added', 0)} added, {counts.get('updated', 0)} updated, "
+                        f"{counts.get('unchanged', 0)} unchanged in {target_project}"
+                    )
+                    if counts.get("rejected", 0):
+                        st.warning(f"⚠️ {counts['rejected']} file(s) point outside the project and were skipped")
+                    if counts.get("error", 0):
+                        st.error(f"❌ {counts['error']} file(s) could not be written – see the change summary")
+                    with st.expander("📝 Change summary"):
+                        st.dataframe(pd.DataFrame(write_rows), width='stretch', hide_index=True)
+            else:
+                try:
+                    export_start = time.perf_counter()
+                    archive = build_project_zip(files, compression_level, zip64)
+                except zipfile.LargeZipFile:
+                    st.error("❌ The archive needs ZIP64 – enable it and try again")
+                else:
+                    st.caption(
+                        f"🗜️ {len(files)} file(s), {len(archive) / 1024:,.1f} KB, "
+                        f"built in {(time.perf_counter() - export_start) * 1000:.0f} ms"
+                    )
+                    st.download_button(
+                        "📥 Download Project ZIP",
+                        archive,
+                        "react_native_project.zip",
+                        "application/zip"
+                    )
+                    st.success("✅ Project archive created successfully!")
 
 
 # ====================== FOOTER ======================
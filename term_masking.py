@@ -0,0 +1,136 @@
+# term_masking.py
+
+
+import re
+from functools import lru_cache
+
+
+# Sensitive term → neutral replacement (case of each match is preserved)
+DEFAULT_MASK_TERMS = {"GIB": "ABC"}
+
+
+def parse_mask_terms(value: str) -> dict:
+    """'GIB:ABC, Gulf International Bank:ABC Bank' → {'GIB': 'ABC', 'Gulf International Bank': 'ABC Bank'}"""
+    terms = {}
+    for item in (value or "").split(","):
+        term, sep, replacement = item.partition(":")
+        if sep and term.strip() and replacement.strip():
+            terms[term.strip()] = replacement.strip()
+    return terms
+
+
+def _match_case(matched: str, replacement: str) -> str:
+    if matched.isupper():
+        return replacement.upper()
+    if matched.islower():
+        return replacement.lower()
+    return replacement.title()
+
+
+def build_trie_pattern(terms) -> str:
+    """Compile lowercase terms into one regex shaped like their prefix trie.
+    Shared prefixes are tested once and optional tails make the longest term win"""
+    trie = {}
+    for term in terms:
+        node = trie
+        for ch in term:
+            node = node.setdefault(ch, {})
+        node[""] = {}
+
+    def emit(node):
+        branches = []
+        for ch, child in sorted(node.items()):
+            if ch == "":
+                continue
+            # Collapse single-child chains into a literal run
+            run = re.escape(ch)
+            while len(child) == 1 and "" not in child:
+                (next_ch, next_child), = child.items()
+                run += re.escape(next_ch)
+                child = next_child
+            branches.append(run + emit(child))
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        if "" in node:
+            return body + "?" if body.startswith("(?:") else f"(?:{body})?"
+        return body
+
+    return emit(trie)
+
+
+class TermMasker:
+    """Masks a dictionary of terms in one pass over the text and reverses the mapping on model output"""
+
+    def __init__(self, terms: dict):
+        self.terms = {term.lower(): replacement for term, replacement in terms.items() if term}
+        pattern = build_trie_pattern(self.terms)
+        self.pattern = re.compile(pattern) if pattern else None
+        self.pattern_ignorecase = re.compile(pattern, re.IGNORECASE) if pattern else None
+        self._reverse = None
+
+    def _spans(self, text: str):
+        """(start, end) of every term occurrence (any case) – letters on both sides in lower case mean a longer
+        word, which is skipped"""
+        lowered = text.lower()
+        if len(lowered) == len(text):
+            matches = self.pattern.finditer(lowered)
+        else:
+            # Some characters change length when lower-cased – scan the original instead
+            matches = self.pattern_ignorecase.finditer(text)
+
+        for match in matches:
+            start, end = match.span()
+            before = text[start - 1] if start > 0 else ""
+            after = text[end] if end < len(text) else ""
+            if before.isalpha() and before.islower() and after.isalpha() and after.islower():
+                continue  # "eligible", "GIBbing"
+            yield start, end
+
+    def mask(self, text: str) -> str:
+        """Replace every term (any case) – letters on both sides in lower case mean a longer word, which is kept"""
+        if not text or self.pattern is None:
+            return text
+
+        parts = []
+        pos = 0
+        for start, end in self._spans(text):
+            matched = text[start:end]
+            parts.append(text[pos:start])
+            parts.append(_match_case(matched, self.terms[matched.lower()]))
+            pos = end
+        if not parts:
+            return text
+        parts.append(text[pos:])
+        return "".join(parts)
+
+    @property
+    def reverse(self) -> "TermMasker":
+        if self._reverse is None:
+            reverse_terms = {}
+            for term, replacement in self.terms.items():
+                reverse_terms.setdefault(replacement, term)
+            self._reverse = TermMasker(reverse_terms)
+        return self._reverse
+
+    def collisions(self, text: str) -> list:
+        """Replacements that already occur in the source material – unmasking would rewrite them too"""
+        if not text or self.reverse.pattern is None:
+            return []
+        # Same matching as unmask – a replacement inside a longer word is never rewritten, so it is no collision
+        found = {text[start:end].lower() for start, end in self.reverse._spans(text)}
+        return sorted(r for r in {r.lower() for r in self.terms.values()} if r in found)
+
+    def unmask(self, text: str) -> str:
+        """Restore the real terms in model output (the replacements must not occur in the source material)"""
+        return self.reverse.mask(text)
+
+
+@lru_cache(maxsize=8)
+def _compiled_masker(items: tuple) -> TermMasker:
+    return TermMasker(dict(items))
+
+
+def get_masker(terms: dict) -> TermMasker:
+    """Compile a term dictionary once per process"""
+    return _compiled_masker(tuple(sorted(terms.items())))
@@ -0,0 +1,31 @@
+# test_bundle_parser.py
+
+
+from bundle_parser import parse_bundle_files
+
+
+def test_prose_after_the_closing_fence_is_dropped_and_reported():
+    bundle = "###FilePath: app/a.ts\n```ts\nconst a = 1;\n```\nThis file defines a.\n\n###FilePath: app/b.ts\n```ts\nconst b = 2;\n```\n"
+    records, issues = parse_bundle_files(bundle)
+    assert [(r.path, r.content) for r in records] == [("app/a.ts", "const a = 1;"), ("app/b.ts", "const b = 2;")]
+    assert [(i["path"], i["line"], i["issue"]) for i in issues] == [("app/a.ts", 5, "trailing-text")]
+
+
+def test_fenced_blocks_inside_a_file_are_kept():
+    bundle = "###FilePath: docs/README.md\n````markdown\n# Usage\n```ts\nuse();\n```\nDone.\n````\n"
+    records, issues = parse_bundle_files(bundle)
+    assert records[0].content == "# Usage\n```ts\nuse();\n```\nDone."
+    assert issues == []
+
+
+def test_unfenced_file_is_trimmed():
+    records, issues = parse_bundle_files("###FilePath: app/a.ts\n\nconst a = 1;\n\n```\n")
+    assert records[0].content == "const a = 1;"
+    assert issues == []
+
+
+def test_text_before_the_first_marker_is_reported():
+    bundle = "Here is the code:\n\n```\n###FilePath: app/a.ts\nconst a = 1;\n"
+    records, issues = parse_bundle_files(bundle)
+    assert [r.path for r in records] == ["app/a.ts"]
+    assert [(i["line"], i["issue"]) for i in issues] == [(1, "text-outside-files")]
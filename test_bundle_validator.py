@@ -0,0 +1,45 @@
+# test_bundle_validator.py
+
+
+from bundle_validator import check_bundle
+
+
+def test_relocated_hook_keeps_relative_imports_pointing_at_the_view():
+    files = [("app/features/cc/views/pd/hooks/use-pd.ts", "import { T } from '../types';\n\nexport const usePd = (): T => ({});\n")]
+    result, violations = check_bundle(files)
+
+    path, content = result[0]
+    assert path == "app/features/cc/hooks/use-pd.ts"
+    assert "from '@app/features/cc/views/pd/types'" in content
+    assert any(v["rule"] == "feature-level-path" for v in violations)
+
+
+def test_relocated_hook_local_imports_become_aliases():
+    files = [("app/features/cc/views/pd/use-pd.ts", "import { helper } from './helper';\n")]
+    result, _ = check_bundle(files)
+    assert result[0] == ("app/features/cc/hooks/use-pd.ts", "import { helper } from '@app/features/cc/views/pd/helper';\n")
+
+
+def test_imports_of_a_relocated_file_follow_the_move():
+    files = [
+        ("app/features/cc/views/pd/hooks/use-pd.ts", "export const usePd = () => ({});\n"),
+        ("app/features/cc/views/pd/index.tsx", "import { usePd } from './hooks/use-pd';\n"),
+    ]
+    result, _ = check_bundle(files)
+    assert "from '@app/features/cc/hooks/use-pd'" in dict(result)["app/features/cc/views/pd/index.tsx"]
+
+
+def test_component_types_import_is_local():
+    content = (
+        "import React from 'react';\n"
+        "import {Label, Input} from '@app/components';\n"
+        "import {useNewTheme} from 'react-core';\n"
+        "import {getStyles} from './styles';\n"
+        "import {ScreenNameProps} from './types';\n"
+        "import {variants} from '@app/components/label/types';\n"
+        "\n"
+        "export const View = () => null;\n"
+    )
+    result, violations = check_bundle([("app/features/cc/views/pd/index.tsx", content)])
+    assert result[0][1] == content
+    assert not [v for v in violations if v["rule"] == "import-order"]
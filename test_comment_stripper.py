@@ -0,0 +1,33 @@
+# test_comment_stripper.py
+
+
+from comment_stripper import remove_comments_from_code, strip_comments
+
+
+def test_line_and_block_comments_are_removed():
+    assert strip_comments("const a = 1; // one\n/* two */const b = 2;") == "const a = 1;\nconst b = 2;"
+
+
+def test_comment_markers_inside_strings_are_kept():
+    source = "const url = 'https://example.com/a'; const glob = \"src/**/*.ts\"; // note"
+    assert strip_comments(source) == "const url = 'https://example.com/a'; const glob = \"src/**/*.ts\";"
+
+
+def test_template_literals_with_substitutions_are_kept():
+    source = "const s = `// not a comment ${value /* gone */ + `/* nested ${x} */`} done`; // gone"
+    assert strip_comments(source) == "const s = `// not a comment ${value  + `/* nested ${x} */`} done`;"
+
+
+def test_regex_literals_are_kept():
+    source = "const re = /\\/\\/+/g; // slashes\nconst half = total / 2; // divide"
+    assert strip_comments(source) == "const re = /\\/\\/+/g;\nconst half = total / 2;"
+
+
+def test_jsx_comments_are_removed():
+    source = "<View>\n  {/* header */}\n  <Text>{'// kept'}</Text>\n</View>"
+    assert remove_comments_from_code(source) == "<View>\n\n  <Text>{'// kept'}</Text>\n</View>"
+
+
+def test_bundle_markers_and_fences_pass_through():
+    source = "###FilePath: app/a.ts\n```ts\nconst a = `x`; // c\n```\n"
+    assert strip_comments(source) == "###FilePath: app/a.ts\n```ts\nconst a = `x`;\n```\n"
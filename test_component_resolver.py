@@ -0,0 +1,18 @@
+# test_component_resolver.py
+
+
+from component_resolver import build_mapping_rows, match_name, resolve_instances
+
+
+def test_match_name_returns_the_matched_export(component_index):
+    assert match_name("Text input", component_index)[1:] == ("token", 0.5, "Input")
+    assert match_name("password-input", component_index)[1:] == ("exact", 1.0, "PasswordInput")
+    assert match_name("Custom input", component_index)[3] == "CurrencyComponent"
+    assert match_name("Sticky button bar", component_index)[3] == "StickyButtonBar"
+
+
+def test_resolved_rows_report_the_matched_export(component_index):
+    document = {"type": "FRAME", "children": [{"type": "INSTANCE", "name": "Text input", "componentId": "1:2"}]}
+    resolved = resolve_instances([document], {}, component_index)
+    assert [(r["folder"], r["component"]) for r in resolved] == [("custom-input", "Input")]
+    assert build_mapping_rows(resolved)[0][2].startswith("<Input> ×1")
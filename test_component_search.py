@@ -0,0 +1,26 @@
+# test_component_search.py
+
+
+import os
+
+from component_resolver import index_components
+from component_search import ComponentSearchIndex
+
+
+def test_search_ranks_folders_by_their_best_name(component_index):
+    results = ComponentSearchIndex(component_index).search("passwrd")
+    assert results[0][:2] == ("custom-input", "PasswordInput")
+
+
+def test_empty_query_returns_every_folder(component_index):
+    assert [folder for folder, _, _ in ComponentSearchIndex(component_index).search("  ")] == ["custom-input", "label", "sticky-button-bar"]
+
+
+def test_digit_only_query_falls_back_to_substring_match(component_library):
+    os.makedirs(os.path.join(component_library, "header-v2"))
+    with open(os.path.join(component_library, "header-v2", "index.tsx"), "w", encoding="utf-8") as f:
+        f.write("export const Header2 = () => null;\n")
+    index = ComponentSearchIndex(index_components(component_library, ["label", "header-v2", "sticky-button-bar"]))
+
+    assert index.search("2") == [("header-v2", "header-v2", 1.0)]
+    assert index.search("-") == [("header-v2", "header-v2", 1.0), ("sticky-button-bar", "sticky-button-bar", 1.0)]
@@ -0,0 +1,19 @@
+# test_corpus_cache.py
+
+
+import os
+
+from corpus_cache import get_corpus_cache
+
+
+def test_folder_sources_skips_assets_and_non_sources(component_library):
+    folder = os.path.join(component_library, "label")
+    os.makedirs(os.path.join(folder, "assets"))
+    for name in ("assets/icon.tsx", "styles.ts", "README.md"):
+        with open(os.path.join(folder, name), "w", encoding="utf-8") as f:
+            f.write("x")
+
+    cache = get_corpus_cache(component_library)
+    expected = [os.path.join(folder, "index.tsx"), os.path.join(folder, "styles.ts")]
+    assert cache.folder_sources("label") == expected
+    assert cache.folder_sources(folder) == expected
@@ -0,0 +1,20 @@
+# test_figma_layout.py
+
+
+from figma_layout import parse_scale_list, parse_spacing_scale
+
+
+def test_spacing_scale_ignores_letter_spacing():
+    theme = "letterSpacing: {tight: -0.5, wide: 1}, spacing: {xs: 4, sm: 8}"
+    assert parse_spacing_scale(theme) == [4.0, 8.0]
+
+
+def test_spacing_scale_skips_a_type_annotation():
+    theme = "export const spacing: {[key: string]: number} = {'spacing-01': 4, 'spacing-02': 8, 'spacing-03': 16};"
+    assert parse_spacing_scale(theme) == [4.0, 8.0, 16.0]
+    assert parse_spacing_scale("const Spacing: number[] = [0, 4, 8];") == [0.0, 4.0, 8.0]
+    assert parse_spacing_scale("Spacing = [4, 8]") == [4.0, 8.0]
+
+
+def test_scale_list_accepts_px_and_trailing_commas():
+    assert parse_scale_list("0, 4px, 8,") == [0.0, 4.0, 8.0]
@@ -0,0 +1,39 @@
+# test_jsx_skeleton.py
+
+
+from jsx_skeleton import build_view_skeleton
+
+
+def test_skeleton_uses_the_matched_export_of_a_multi_export_file(component_index):
+    document = {
+        "type": "FRAME",
+        "name": "Screen",
+        "children": [{"type": "INSTANCE", "name": "Text input", "componentId": "1:2"}],
+    }
+    skeleton = build_view_skeleton([document], {}, component_index, [])
+    assert "<Input id=" in skeleton
+    assert "import {Input} from '@app/components';" in skeleton
+    assert "CurrencyComponent" not in skeleton
+
+
+def test_whole_file_payload_descends_to_the_page_frames(component_index):
+    document = {
+        "type": "DOCUMENT",
+        "children": [{
+            "type": "CANVAS",
+            "name": "Page 1",
+            "children": [{
+                "type": "FRAME",
+                "name": "Login",
+                "children": [{"type": "INSTANCE", "name": "Text input", "componentId": "1:2"}],
+            }],
+        }],
+    }
+    skeleton = build_view_skeleton([document], {}, component_index, [])
+    assert '<View style={styles.login}>' in skeleton
+    assert "<Input id=" in skeleton
+
+
+def test_nothing_renderable_gives_no_skeleton(component_index):
+    document = {"type": "DOCUMENT", "children": [{"type": "CANVAS", "children": []}]}
+    assert build_view_skeleton([document], {}, component_index, []) == "None"
@@ -0,0 +1,21 @@
+# test_prompt_dedup.py
+
+
+from prompt_dedup import deduplicate_sections
+
+
+BLOCK = "\n".join(f"const value{i} = {i};" for i in range(10))
+
+
+def test_project_sections_are_not_cut_against_per_screen_samples():
+    sections = {"sample_code": "// sample\n" + BLOCK, "package_structure": BLOCK}
+    result, rows = deduplicate_sections(sections, "")
+    assert result["package_structure"] == BLOCK
+    assert "lines omitted" in result["sample_code"]
+    assert [(row["section"], row["repeated from"]) for row in rows] == [("sample_code", "package_structure")]
+
+
+def test_instructions_are_never_cut():
+    result, rows = deduplicate_sections({"api_endpoints": BLOCK}, BLOCK)
+    assert "lines omitted" in result["api_endpoints"]
+    assert rows[0]["repeated from"] == "prompt instructions"
@@ -0,0 +1,25 @@
+# test_term_masking.py
+
+
+from term_masking import TermMasker, get_masker, parse_mask_terms
+
+
+MASKER = get_masker(parse_mask_terms("GIB:ABC, Gulf International Bank:ABC Bank"))
+
+
+def test_mask_unmask_round_trip_keeps_case():
+    text = "GIB app by Gulf International Bank – gib users, Gib support"
+    masked = MASKER.mask(text)
+    assert masked == "ABC app by Abc Bank – abc users, Abc support"
+    assert MASKER.unmask(masked) == "GIB app by Gulf International Bank – gib users, Gib support"
+
+
+def test_terms_inside_longer_words_are_kept():
+    assert MASKER.mask("eligible GIBbing GIB-card gibCard") == "eligible ABCbing ABC-card abcCard"
+
+
+def test_collisions_follow_the_in_word_guard():
+    masker = TermMasker({"GIB": "ABC"})
+    assert masker.collisions("The cabcd grabber") == []
+    assert masker.collisions("ABC screen") == ["abc"]
+    assert masker.collisions("") == []
@@ -0,0 +1,25 @@
+# test_translation_extractor.py
+
+
+from translation_extractor import inject_en_block
+
+
+TRANSLATIONS = [("CcPdLblTitle", "Title"), ("CcPdBtnNext", "Next")]
+
+
+def test_entries_replace_the_marker():
+    code = "export const en = {\n  // @pregenerated-en\n  CcPdLblExtra: 'Extra',\n};"
+    assert inject_en_block(code, TRANSLATIONS) == (
+        "export const en = {\n  CcPdLblTitle: 'Title',\n  CcPdBtnNext: 'Next',\n  CcPdLblExtra: 'Extra',\n};", True
+    )
+
+
+def test_entries_go_to_the_top_of_en_without_a_marker():
+    code = "export const en = {\n  CcPdLblExtra: 'Extra',\n};\n\nexport const ar = {\n};"
+    result, inserted = inject_en_block(code, TRANSLATIONS)
+    assert inserted
+    assert result.startswith("export const en = {\n  CcPdLblTitle: 'Title',\n  CcPdBtnNext: 'Next',\n  CcPdLblExtra: 'Extra',")
+
+
+def test_missing_en_object_is_reported():
+    assert inject_en_block("export const ar = {};", TRANSLATIONS) == ("export const ar = {};", False)
@@ -0,0 +1,91 @@
+# token_budget.py
+
+
+import re
+
+
+# Rough Gemini-style token pieces: words split every 4 characters, each symbol its own token
+TOKEN_PIECE = re.compile(r"\w{1,4}|[^\w\s]")
+
+# Gemini bills roughly one 258-token tile per (downscaled) image
+IMAGE_TOKENS = 258
+
+DEFAULT_INPUT_BUDGET = 1_000_000
+
+# Section → (trim order, tokens always kept). Lower trim order is trimmed first;
+# sections not listed here are never trimmed.
+GENERATE_TRIM_POLICY = {
+    "sample_code": (1, 2_000),
+    "existing_components": (2, 8_000),
+    "package_structure": (3, 500),
+    "api_endpoints": (4, 2_000),
+    "user_stories_file_content": (5, 2_000),
+    "conventions_and_standards": (6, 4_000),
+}
+
+
+def estimate_tokens(text) -> int:
+    """Estimate the token count of a text locally (no API call)"""
+    if not text:
+        return 0
+    return len(TOKEN_PIECE.findall(str(text)))
+
+
+def parse_trim_order(value: str, policy: dict) -> dict:
+    """Override the trim order from a comma separated list of section names (first is trimmed first)"""
+    names = [n.strip() for n in (value or "").split(",") if n.strip()]
+    if not names:
+        return policy
+    return {
+        name: (order, policy.get(name, (0, 0))[1])
+        for order, name in enumerate(names, 1)
+    }
+
+
+def truncate_to_tokens(text: str, tokens: int, keep_tokens: int) -> str:
+    """Cut text to about `keep_tokens`, on a line boundary, with a marker noting what was dropped"""
+    if keep_tokens <= 0:
+        return f"[omitted – {tokens} tokens over budget]"
+    cut = int(len(text) * keep_tokens / tokens)
+    newline = text.rfind("\n", 0, cut)
+    if newline > cut // 2:
+        cut = newline
+    return text[:cut] + f"\n... [truncated – ~{tokens - keep_tokens} tokens over budget]"
+
+
+def plan_budget(sections: dict, static_text: str, budget: int, policy: dict, image_count: int = 0, image_tokens: int = None) -> tuple:
+    """Estimate tokens per section and trim by policy until the prompt fits the budget.
+    Returns (sections, rows, total) – rows hold the per-section breakdown for display"""
+    tokens = {name: estimate_tokens(text) for name, text in sections.items()}
+    static_tokens = estimate_tokens(static_text)
+    if image_tokens is None:
+        image_tokens = image_count * IMAGE_TOKENS
+    total = static_tokens + image_tokens + sum(tokens.values())
+
+    kept = dict(tokens)
+    over = total - budget
+    for name in sorted((n for n in policy if n in tokens), key=lambda n: policy[n][0]):
+        if over <= 0:
+            break
+        reducible = tokens[name] - policy[name][1]
+        if reducible <= 0:
+            continue
+        cut = min(over, reducible)
+        kept[name] = tokens[name] - cut
+        over -= cut
+
+    trimmed_sections = dict(sections)
+    for name in sections:
+        if kept[name] < tokens[name]:
+            trimmed_sections[name] = truncate_to_tokens(str(sections[name]), tokens[name], kept[name])
+
+    rows = [{"section": "instructions (template)", "tokens": static_tokens, "kept": static_tokens}]
+    if image_count:
+        rows.append({"section": f"images ×{image_count}", "tokens": image_tokens, "kept": image_tokens})
+    rows += [{"section": name, "tokens": tokens[name], "kept": kept[name]} for name in sections]
+
+    final_total = static_tokens + image_tokens + sum(kept.values())
+    for row in rows:
+        row["trimmed"] = row["tokens"] - row["kept"]
+        row["share"] = f"{row['kept'] / final_total:.1%}" if final_total else "0%"
+    return trimmed_sections, rows, final_total
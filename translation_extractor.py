@@ -0,0 +1,161 @@
+# translation_extractor.py
+
+
+import re
+
+from component_resolver import tokenize_name
+
+
+# ====================== ABBREVIATION RULES ======================
+
+
+# Checked in order against the TEXT layer name, then the enclosing INSTANCE name
+ABBREVIATION_RULES = [
+    ("Plc", ("placeholder",)),
+    ("Error", ("error",)),
+    ("Info", ("helper", "hint", "info", "information", "tooltip", "alert", "disclaimer")),
+    ("Btn", ("button", "btn", "cta", "action", "actions")),
+    ("Chk", ("checkbox", "check", "toggle", "radio")),
+    ("Plc", ("input", "field", "textfield", "dropdown", "select", "search")),
+]
+
+DEFAULT_ABBREVIATION = "Lbl"
+
+EN_MARKER = "// @pregenerated-en"
+
+MAX_FIELD_WORDS = 4
+
+
+def infer_abbreviation(layer_name: str, instance_name: str) -> str:
+    """Infer the translation key abbreviation (Lbl/Btn/Plc/Chk/Info/Error) from layer and parent instance names"""
+    # Any word of the layer name counts; for the instance only its head noun
+    # ("Sticky button bar" is a bar, not a button)
+    instance_tokens = tokenize_name(instance_name)
+    for tokens in (set(tokenize_name(layer_name)), set(instance_tokens[-1:])):
+        for abbreviation, keywords in ABBREVIATION_RULES:
+            if tokens.intersection(keywords):
+                return abbreviation
+    return DEFAULT_ABBREVIATION
+
+
+def to_title_case(text: str, max_words: int = None) -> str:
+    """'Compare cards' → 'CompareCards' (alphanumeric words only)"""
+    words = re.findall(r"[A-Za-z0-9]+", text or "")
+    if max_words:
+        words = words[:max_words]
+    return "".join(w[0].upper() + w[1:] for w in words)
+
+
+def to_kebab_case(text: str) -> str:
+    """'CreditCard' / 'Credit Card' → 'credit-card'"""
+    return "-".join(tokenize_name(text))
+
+
+# ====================== EXTRACTION ======================
+
+
+def _iter_text_nodes(node: dict, component_names: dict, instance_name: str = ""):
+    """Yield (text node, nearest enclosing instance name) depth first"""
+    if node.get("type") == "INSTANCE":
+        instance_name = component_names.get(node.get("componentId")) or node.get("name", "")
+    if node.get("type") == "TEXT":
+        yield node, instance_name
+    for child in node.get("children") or []:
+        yield from _iter_text_nodes(child, component_names, instance_name)
+
+
+def extract_translations(documents: list, component_names: dict, journey: str, screen_name: str) -> list:
+    """Collect TEXT `characters` and build (key, text) pairs following <<Journey>><<ScreenName>><<Abbrev>><<Field>>"""
+    prefix = to_title_case(journey or "Journey") + to_title_case(screen_name or "ScreenName")
+
+    entries = {}
+    texts_seen = {}
+    for document in documents:
+        for node, instance_name in _iter_text_nodes(document, component_names):
+            text = " ".join((node.get("characters") or "").split())
+            # Skip dynamic values (amounts, times, dates) – nothing to translate
+            if not re.search(r"[A-Za-z]", text):
+                continue
+
+            abbreviation = infer_abbreviation(node.get("name", ""), instance_name)
+            if (abbreviation, text) in texts_seen:
+                continue
+
+            base_key = prefix + abbreviation + (to_title_case(text, MAX_FIELD_WORDS) or "Text")
+            key = base_key
+            suffix = 2
+            while key in entries:
+                key = f"{base_key}{suffix}"
+                suffix += 1
+
+            entries[key] = text
+            texts_seen[(abbreviation, text)] = key
+
+    return list(entries.items())
+
+
+# ====================== OUTPUT ======================
+
+
+def _ts_string(text: str) -> str:
+    return "'" + text.replace("\\", "\\\\").replace("'", "\\'") + "'"
+
+
+def build_en_entries(translations: list, indent: str = "  ") -> str:
+    """Render `Key: 'text',` lines for the English translation object"""
+    return "\n".join(f"{indent}{key}: {_ts_string(text)}," for key, text in translations)
+
+
+def build_en_block(translations: list) -> str:
+    """Render the English translation object for translations.ts"""
+    return "export const en = {\n" + build_en_entries(translations) + "\n};"
+
+
+def build_translations_section(translations: list, journey: str, screen_name: str) -> str:
+    """Prompt section listing the fixed translation keys and their target file"""
+    if not translations:
+        return "None"
+
+    path = (
+        f"app/features/{to_kebab_case(journey) or '{feature}'}"
+        f"/views/{to_kebab_case(screen_name) or '{screen-name}'}/translations.ts"
+    )
+    return "\n".join([
+        f"Target file: {path}",
+        "",
+        build_en_block(translations),
+    ])
+
+
+EN_OBJECT_START = re.compile(r"^([ \t]*)export\s+const\s+en\b[^=\n]*=\s*\{[ \t]*$", re.MULTILINE)
+
+
+def inject_en_block(generated: str, translations: list) -> tuple:
+    """Put the pre-generated `en` entries at the `// @pregenerated-en` marker line emitted by the model, or right
+    after `export const en = {` when the marker was left out. Returns (code, inserted) – inserted is False when
+    there were entries but no place to put them"""
+    if not translations:
+        return generated, True
+
+    def replace(match):
+        return build_en_entries(translations, match.group(1))
+
+    marker = re.compile(r"^([ \t]*)" + re.escape(EN_MARKER) + r"[ \t]*$", re.MULTILINE)
+    if marker.search(generated):
+        return marker.sub(replace, generated, count=1), True
+
+    start = EN_OBJECT_START.search(generated)
+    if not start:
+        return generated, False
+    entries = build_en_entries(translations, start.group(1) + "  ")
+    return generated[:start.end()] + "\n" + entries + generated[start.end():], True
+
+
+def parse_journey_and_screen(mapping: str) -> tuple:
+    """Read the first non-empty 'Feature:' and 'Screen Name:' values from the component mapping text"""
+    journeys = re.findall(r"^\s*Feature(?:\s*Name)?\s*:[ \t]*(.*)$", mapping or "", re.IGNORECASE | re.MULTILINE)
+    screens = re.findall(r"^\s*Screen\s*Name(?:\s*\(ViewName\))?\s*:[ \t]*(.*)$", mapping or "", re.IGNORECASE | re.MULTILINE)
+    return (
+        next((j.strip() for j in journeys if j.strip()), ""),
+        next((s.strip() for s in screens if s.strip()), ""),
+    )